@@ -1,20 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+import orjson
 import os
 import json
 import tempfile
 import logging
-from services.pdf_extractor import PDFExtractor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import wraps
+from google.oauth2 import service_account
+from services.pdf_extractor import PDFExtractor, CLOUD_PLATFORM_SCOPE
+from services.local_extractor import extract_text_layer, prescan_tables
 from chunked_processor import ChunkedPDFProcessor
+from services.job_queue import JobQueue, QueueFullError
+from services.result_cache import ResultCache
 from utils.config import Config
+from utils.file_handler import FileHandler
+from utils.temp_pool import TempFilePool
+from utils.temp_sweeper import TempFileSweeper
 
 # Configure logging first
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=Config.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 
 def setup_google_credentials():
-    """Setup Google Cloud credentials for production"""
+    """
+    Setup Google Cloud credentials for production
+
+    Returns:
+        Service account credentials parsed from GOOGLE_SERVICE_ACCOUNT_JSON,
+        or None to fall back to Application Default Credentials
+    """
     try:
         # Check if we have service account JSON in environment variable
         service_account_json = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
@@ -28,22 +46,20 @@ def setup_google_credentials():
             try:
                 credentials_data = json.loads(service_account_json)
                 logger.info(
-                    f"Service account for project: {credentials_data.get('project_id', 'unknown')}"
+                    "Service account for project: %s",
+                    credentials_data.get("project_id", "unknown"),
                 )
             except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in GOOGLE_SERVICE_ACCOUNT_JSON: {e}")
+                logger.error("Invalid JSON in GOOGLE_SERVICE_ACCOUNT_JSON: %s", e)
                 raise ValueError("Invalid JSON in GOOGLE_SERVICE_ACCOUNT_JSON")
 
-            # Create temporary file for credentials
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".json", delete=False
-            ) as f:
-                f.write(service_account_json)
-                credentials_path = f.name
-
-            # Set the environment variable for Google Cloud libraries
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
-            logger.info(f"Google credentials file created at: {credentials_path}")
+            # Build the credentials in memory instead of writing the key to a
+            # temp file for the client library to read back and re-parse
+            credentials = service_account.Credentials.from_service_account_info(
+                credentials_data, scopes=[CLOUD_PLATFORM_SCOPE]
+            )
+            logger.info("Google credentials loaded from environment")
+            return credentials
 
         elif os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
             logger.info("Using existing GOOGLE_APPLICATION_CREDENTIALS file path")
@@ -53,24 +69,27 @@ def setup_google_credentials():
                 "No Google credentials found. Service will start but Document AI will fail."
             )
 
+        return None
+
     except Exception as e:
-        logger.error(f"Error setting up Google credentials: {e}")
+        logger.error("Error setting up Google credentials: %s", e)
         raise
 
 
 # Setup Google credentials before validating config
 try:
-    setup_google_credentials()
+    google_credentials = setup_google_credentials()
 except Exception as e:
-    logger.error(f"Failed to setup Google credentials: {e}")
+    logger.error("Failed to setup Google credentials: %s", e)
     # Don't raise here - let the service start and fail gracefully
+    google_credentials = None
 
 # Validate Google Cloud configuration
 try:
     Config.validate_google_config()
     logger.info("Google Cloud configuration validated successfully")
 except ValueError as e:
-    logger.error(f"Google Cloud configuration error: {str(e)}")
+    logger.error("Google Cloud configuration error: %s", e)
     logger.error("Please set the following environment variables:")
     logger.error("- GOOGLE_PROJECT_ID")
     logger.error("- GOOGLE_PROCESSOR_ID")
@@ -81,259 +100,432 @@ except ValueError as e:
     logger.error("")
     logger.error("Service will start but Document AI features will not work.")
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for Node.js communication
+# Read raw uploads in 1MB blocks
+UPLOAD_CHUNK_SIZE = 1 << 20
 
-# Initialize PDF extractor and chunked processor
-try:
-    pdf_extractor = PDFExtractor()
-    chunked_processor = ChunkedPDFProcessor()  # Uses MAX_PAGES_PER_REQUEST from config
-    logger.info("PDF extractor and chunked processor initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize PDF extractor: {e}")
-    pdf_extractor = None
-    chunked_processor = None
+# Seconds clients are told to wait when every processing slot is taken
+BUSY_RETRY_AFTER = 5
 
 
-@app.route("/health", methods=["GET"])
-def health_check():
-    """Health check endpoint"""
-    status = {
-        "status": "healthy",
-        "service": "pdf-extractor",
-        "google_cloud_configured": pdf_extractor is not None,
-    }
-    return jsonify(status)
+class StreamingRequest(Request):
+    """Request that spools multipart file parts to disk instead of memory"""
 
+    def _get_file_stream(
+        self, total_content_length, content_type, filename=None, content_length=None
+    ):
+        # Werkzeug keeps parts under 500KB in a BytesIO; always use a temp file
+        return tempfile.NamedTemporaryFile("wb+")
 
-@app.route("/extract", methods=["POST"])
-def extract_pdf():
-    """Main PDF extraction endpoint with automatic chunking for large PDFs"""
-    try:
-        logger.info("=== EXTRACT ENDPOINT CALLED ===")
-        logger.info(f"Request method: {request.method}")
-        logger.info(f"Request files: {list(request.files.keys())}")
-
-        if not pdf_extractor:
-            return jsonify(
-                {
-                    "status": "error",
-                    "message": "PDF extractor not initialized. Check Google Cloud configuration.",
-                }
-            ), 500
-
-        # Check if file is provided
-        if "file" not in request.files:
-            logger.error("No file provided in request")
-            return jsonify({"error": "No file provided"}), 400
-
-        file = request.files["file"]
-        if file.filename == "":
-            logger.error("No file selected")
-            return jsonify({"error": "No file selected"}), 400
-
-        logger.info(f"Received file: {file.filename}")
-        logger.info(f"File content type: {file.content_type}")
-        logger.info(f"File content length: {file.content_length}")
-
-        # Validate file type
-        if not file.filename.lower().endswith(".pdf"):
-            logger.error(
-                f"Invalid file type: {file.filename}. Only PDF files are supported."
-            )
-            return jsonify({"error": "Only PDF files are supported"}), 400
 
-        # Save uploaded file temporarily
-        temp_path = f"temp_{file.filename}"
-        logger.info(f"Saving file to: {temp_path}")
-        file.save(temp_path)
-        logger.info(
-            f"File saved successfully. Size: {os.path.getsize(temp_path)} bytes"
-        )
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, much faster for large extraction results"""
 
-        try:
-            # Use chunked processor for smart PDF processing
-            logger.info(f"Starting smart PDF processing for: {file.filename}")
-            results = chunked_processor.process_pdf(temp_path)
-            logger.info(f"PDF processing completed successfully")
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
 
-            return jsonify(
-                {"success": True, "data": results, "filename": file.filename}
-            )
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                logger.info(f"Cleaning up temporary file: {temp_path}")
-                os.remove(temp_path)
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
 
-    except Exception as e:
-        logger.error(f"Error processing PDF: {str(e)}", exc_info=True)
-        return jsonify({"success": False, "error": str(e)}), 500
 
+def stream_json(value, depth: int = 0):
+    """
+    Yield value as JSON bytes in pieces
+
+    The outer two levels of dicts are walked and their lists (pages, tables,
+    ...) are encoded one item at a time, so the full encoded response never
+    sits in memory next to the results it was built from. Values orjson does
+    not handle natively go through the same default hook as jsonify, since an
+    error after the first chunk would leave the client a truncated 200 body.
+    """
+    if isinstance(value, dict) and depth < 2:
+        separator = b"{"
+        for key, item in value.items():
+            yield separator + orjson.dumps(key) + b":"
+            yield from stream_json(item, depth + 1)
+            separator = b","
+        yield b"}" if separator == b"," else b"{}"
+    elif isinstance(value, list):
+        separator = b"["
+        for item in value:
+            yield separator + orjson.dumps(item, default=OrjsonProvider.default)
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+    else:
+        yield orjson.dumps(value, default=OrjsonProvider.default)
+
+
+def json_response(body, status: int = 200):
+    """Stream body as JSON, skipping jsonify for large payloads"""
+    return Response(stream_json(body), status=status, mimetype="application/json")
+
+
+class UploadError(Exception):
+    """Raised when the request does not carry a usable PDF"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def save_upload():
+    """
+    Save the uploaded PDF to a pooled temporary file
+
+    Accepts either a raw request body (Content-Type: application/pdf, optional
+    ?filename=) streamed straight to disk, or a multipart form with a "file" part.
+    The caller must hand the returned path back with temp_pool.release().
+
+    Returns:
+        Tuple of (temp_path, filename)
+    """
+    # Reject on the declared size before any of the body is read
+    max_size = app.config["MAX_CONTENT_LENGTH"]
+    if request.content_length is not None and request.content_length > max_size:
+        raise UploadError(too_large_message(), 413)
 
-@app.route("/extract-text", methods=["POST"])
-def extract_text_only():
-    """Extract only text content using chunked processing"""
     try:
-        logger.info("=== EXTRACT TEXT ENDPOINT CALLED ===")
+        temp_path, filename = _save_upload_body()
+    except RequestEntityTooLarge:
+        # Chunked bodies without a Content-Length trip the limit mid-read
+        raise UploadError(too_large_message(), 413)
 
-        if not pdf_extractor:
-            return jsonify(
-                {"status": "error", "message": "PDF extractor not initialized"}
-            ), 500
+    # The extension alone lets misnamed files through to the PDF parsers
+    if not FileHandler.has_pdf_header(temp_path):
+        temp_pool.release(temp_path)
+        raise UploadError("File is not a valid PDF")
 
-        if "file" not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+    return temp_path, filename
 
-        file = request.files["file"]
-        if file.filename == "":
-            return jsonify({"error": "No file selected"}), 400
 
-        # Validate file type
-        if not file.filename.lower().endswith(".pdf"):
-            return jsonify({"error": "Only PDF files are supported"}), 400
+def _save_upload_body():
+    if request.mimetype == "application/pdf":
+        filename = request.args.get("filename") or "document.pdf"
+        if not filename.lower().endswith(".pdf"):
+            raise UploadError("Only PDF files are supported")
 
-        # Save uploaded file temporarily
-        temp_path = f"temp_text_{file.filename}"
+        temp_path = temp_pool.acquire()
+        try:
+            with open(temp_path, "wb") as tmp:
+                while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+                    tmp.write(chunk)
+                if tmp.tell() == 0:
+                    raise UploadError("No file provided")
+        except Exception:
+            temp_pool.release(temp_path)
+            raise
+
+        logger.info("Streamed raw upload %s to: %s", filename, temp_path)
+        return temp_path, filename
+
+    # Only multipart bodies can carry a "file" part
+    if not request.mimetype.startswith("multipart/") or "file" not in request.files:
+        raise UploadError("No file provided")
+
+    file = request.files["file"]
+    if file.filename == "":
+        raise UploadError("No file selected")
+
+    logger.info("Received file: %s", file.filename)
+    logger.info("File content type: %s", file.content_type)
+    logger.info("File content length: %s", file.content_length)
+
+    # Validate file type
+    if not file.filename.lower().endswith(".pdf"):
+        raise UploadError("Only PDF files are supported")
+
+    temp_path = temp_pool.acquire()
+    try:
         file.save(temp_path)
+    except Exception:
+        temp_pool.release(temp_path)
+        raise
+
+    return temp_path, file.filename
+
+
+def too_large_message() -> str:
+    return f"File too large (max: {app.config['MAX_CONTENT_LENGTH']} bytes)"
+
+
+def dispatch(temp_path: str, build_response):
+    """
+    Run build_response(temp_path) and return its JSON body
+
+    The work runs on the job queue's worker pool. With ?async=true a 202 with
+    the job ID is returned straight away; poll GET /jobs/<job_id> for the
+    result. The temp file goes back to the pool once processing finishes
+    either way, or when a timed-out request is dropped before it started.
+    """
 
+    def run():
         try:
-            # Use chunked processor for smart PDF processing
-            logger.info(f"Starting chunked text extraction for: {file.filename}")
-            results = chunked_processor.process_pdf(temp_path)
-
-            # Extract only text from the results
-            text_data = {
-                "pages": results.get("pages", []),
-                "full_text": results.get("full_text", ""),
-                "metadata": {
-                    "total_pages": results.get("metadata", {}).get("total_pages", 0),
-                    "processing_method": results.get("metadata", {}).get(
-                        "processing_method", "unknown"
-                    ),
-                    "word_count": len(results.get("full_text", "").split()),
-                },
-            }
+            return build_response(temp_path)
+        finally:
+            temp_pool.release(temp_path)
 
-            logger.info(
-                f"Text extraction completed successfully. {text_data['metadata']['word_count']} words extracted"
-            )
-            return jsonify(
-                {"success": True, "text": text_data, "filename": file.filename}
+    try:
+        if request.args.get("async", "").lower() == "true":
+            job_id = job_queue.submit(run)
+            return (
+                jsonify({"success": True, "job_id": job_id, "status": "queued"}),
+                202,
             )
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
 
-    except Exception as e:
-        logger.error(f"Error extracting text: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return json_response(
+            job_queue.run(
+                run,
+                timeout=Config.REQUEST_TIMEOUT,
+                on_cancel=lambda: temp_pool.release(temp_path),
+            )
+        )
+    except QueueFullError:
+        # run() never started, so the file has not been released yet
+        temp_pool.release(temp_path)
+        raise
 
 
-@app.route("/extract-tables", methods=["POST"])
-def extract_tables_only():
-    """Extract only tables from PDF using chunked processing"""
-    try:
-        logger.info("=== EXTRACT TABLES ENDPOINT CALLED ===")
+def busy_response(message: str):
+    """503 telling the client to retry once a processing slot frees up"""
+    response = jsonify({"success": False, "error": message})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(BUSY_RETRY_AFTER)
+    return response
 
-        if not pdf_extractor:
-            return jsonify(
-                {"status": "error", "message": "PDF extractor not initialized"}
-            ), 500
 
-        if "file" not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+def cached_process(path: str, process):
+    """Run process(path), reusing the result for byte-identical PDFs"""
+    key = (FileHandler.compute_sha256(path), process.__name__)
+    return result_cache.get_or_compute(key, lambda: process(path))
 
-        file = request.files["file"]
-        if file.filename == "":
-            return jsonify({"error": "No file selected"}), 400
 
-        # Validate file type
-        if not file.filename.lower().endswith(".pdf"):
-            return jsonify({"error": "Only PDF files are supported"}), 400
+def pdf_endpoint(name: str):
+    """
+    Decorator turning handler(path, filename) -> dict into a PDF upload endpoint
 
-        # Save uploaded file temporarily
-        temp_path = f"temp_tables_{file.filename}"
-        file.save(temp_path)
+    The wrapper checks the service is configured, saves the upload, runs the
+    handler (inline or as a background job, see dispatch) and maps failures to
+    JSON error responses.
+    """
 
-        try:
-            # Use chunked processor for smart PDF processing
-            logger.info(f"Starting chunked table extraction for: {file.filename}")
-            results = chunked_processor.process_pdf(temp_path)
-
-            # Extract only tables from the results
-            tables_data = {
-                "tables": results.get("tables", []),
-                "metadata": {
-                    "total_tables": len(results.get("tables", [])),
-                    "processing_method": results.get("metadata", {}).get(
-                        "processing_method", "unknown"
+    def decorator(handler):
+        @wraps(handler)
+        def view():
+            try:
+                logger.info("=== %s ENDPOINT CALLED ===", name)
+
+                if not chunked_processor:
+                    return jsonify(
+                        {
+                            "status": "error",
+                            "message": "PDF extractor not initialized. Check Google Cloud configuration.",
+                        }
+                    ), 500
+
+                # Reject before reading the body when no slot is free
+                if job_queue.is_full():
+                    return busy_response("Server is busy, try again later")
+
+                # Save uploaded file temporarily
+                try:
+                    temp_path, filename = save_upload()
+                except UploadError as e:
+                    logger.error("Rejected upload: %s", e)
+                    return jsonify({"error": str(e)}), e.status_code
+
+                return dispatch(temp_path, lambda path: handler(path, filename))
+
+            except QueueFullError as e:
+                logger.warning("Rejected %s: %s", request.path, e)
+                return busy_response(str(e))
+            except FutureTimeoutError:
+                logger.error("Timed out processing %s", request.path)
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "error": "Processing timed out; retry with ?async=true",
+                        }
                     ),
-                    "total_pages": results.get("metadata", {}).get("total_pages", 0),
-                },
-            }
+                    504,
+                )
+            except Exception as e:
+                logger.error("Error in %s: %s", request.path, e, exc_info=True)
+                return jsonify({"success": False, "error": str(e)}), 500
+
+        return view
+
+    return decorator
+
+
+def text_projection(results):
+    """Reduce full extraction results to the text-only response shape"""
+    metadata = results.get("metadata", {})
+    return {
+        "pages": results.get("pages", []),
+        "full_text": results.get("full_text", ""),
+        "metadata": {
+            "total_pages": metadata.get("total_pages", 0),
+            "processing_method": metadata.get("processing_method", "unknown"),
+            "word_count": len(results.get("full_text", "").split()),
+        },
+    }
 
-            logger.info(
-                f"Table extraction completed successfully. Found {len(tables_data['tables'])} tables"
-            )
-            return jsonify(
-                {"success": True, "tables": tables_data, "filename": file.filename}
-            )
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
 
-    except Exception as e:
-        logger.error(f"Error extracting tables: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+def tables_projection(results):
+    """Reduce full extraction results to the tables-only response shape"""
+    metadata = results.get("metadata", {})
+    return {
+        "tables": results.get("tables", []),
+        "metadata": {
+            "total_tables": len(results.get("tables", [])),
+            "processing_method": metadata.get("processing_method", "unknown"),
+            "total_pages": metadata.get("total_pages", 0),
+        },
+    }
 
 
-@app.route("/extract-chunked", methods=["POST"])
-def extract_pdf_chunked():
-    """Force chunked processing for large PDFs"""
-    try:
-        logger.info("=== CHUNKED EXTRACT ENDPOINT CALLED ===")
+app = Flask(__name__)
+app.request_class = StreamingRequest
+app.json = OrjsonProvider(app)
+app.config["MAX_CONTENT_LENGTH"] = Config.MAX_FILE_SIZE
+CORS(app)  # Enable CORS for Node.js communication
 
-        if not chunked_processor:
-            return jsonify(
-                {"status": "error", "message": "Chunked processor not initialized"}
-            ), 500
+# Initialize PDF extractor and chunked processor
+try:
+    pdf_extractor = PDFExtractor(credentials=google_credentials)
+    # Uses MAX_PAGES_PER_REQUEST from config
+    chunked_processor = ChunkedPDFProcessor(pdf_extractor=pdf_extractor)
+    logger.info("PDF extractor and chunked processor initialized successfully")
+except Exception as e:
+    logger.error("Failed to initialize PDF extractor: %s", e)
+    pdf_extractor = None
+    chunked_processor = None
 
-        # Check if file is provided
-        if "file" not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+# One upload file per task the job queue accepts
+temp_pool = TempFilePool(size=Config.MAX_PENDING_TASKS)
+
+# Uploads left behind by a crashed worker are never released. The sweeper
+# only removes files whose owning process has exited. With preload_app its
+# thread runs only in the gunicorn master (threads do not survive fork); one
+# sweeper covers every worker's files in the shared directory, so do not
+# start another per worker
+temp_sweeper = TempFileSweeper(
+    temp_pool.directory,
+    max_age=Config.TEMP_FILE_MAX_AGE,
+    interval=Config.TEMP_SWEEP_INTERVAL,
+)
+temp_sweeper.start()
+
+result_cache = ResultCache(
+    maxsize=Config.RESULT_CACHE_SIZE, ttl=Config.RESULT_CACHE_TTL
+)
+
+job_queue = JobQueue(
+    max_workers=Config.MAX_CONCURRENT_TASKS,
+    jobs_folder=Config.JOBS_FOLDER,
+    result_ttl=Config.JOB_RESULT_TTL,
+    max_pending=Config.MAX_PENDING_TASKS,
+)
+
+
+# Health status cannot change after startup, so encode it once
+HEALTH_BODY = json.dumps(
+    {
+        "status": "healthy",
+        "service": "pdf-extractor",
+        "google_cloud_configured": pdf_extractor is not None,
+    }
+).encode()
 
-        file = request.files["file"]
-        if file.filename == "":
-            return jsonify({"error": "No file selected"}), 400
 
-        # Validate file type
-        if not file.filename.lower().endswith(".pdf"):
-            return jsonify({"error": "Only PDF files are supported"}), 400
+@app.errorhandler(RequestEntityTooLarge)
+def handle_too_large(e):
+    """Return a JSON 413 instead of Werkzeug's HTML page"""
+    return jsonify({"success": False, "error": too_large_message()}), 413
 
-        # Save uploaded file temporarily
-        temp_path = f"temp_chunked_{file.filename}"
-        file.save(temp_path)
 
-        try:
-            # Force chunked processing
-            logger.info(f"Starting forced chunked processing for: {file.filename}")
-            results = chunked_processor.process_large_pdf(temp_path)
-            logger.info(f"Chunked processing completed successfully")
+@app.route("/health", methods=["GET"])
+def health_check():
+    """Health check endpoint"""
+    # A fresh Response per probe; after_request hooks (CORS) mutate headers
+    return Response(HEALTH_BODY, mimetype="application/json")
 
-            return jsonify(
-                {"success": True, "data": results, "filename": file.filename}
-            )
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+@app.route("/extract", methods=["POST"])
+@pdf_endpoint("EXTRACT")
+def extract_pdf(path, filename):
+    """Main PDF extraction endpoint with automatic chunking for large PDFs"""
+    logger.info("Starting smart PDF processing for: %s", filename)
+    results = cached_process(path, chunked_processor.process_pdf)
+    logger.info("PDF processing completed successfully")
 
-    except Exception as e:
-        logger.error(f"Error in chunked processing: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return {"success": True, "data": results, "filename": filename}
+
+
+@app.route("/extract-text", methods=["POST"])
+@pdf_endpoint("EXTRACT TEXT")
+def extract_text_only(path, filename):
+    """Extract only text content, from the PDF's text layer when it has one"""
+    logger.info("Starting text extraction for: %s", filename)
+
+    # Born-digital PDFs don't need OCR; scanned ones fall back to Document AI
+    results = cached_process(path, extract_text_layer)
+    if results is None:
+        results = cached_process(path, chunked_processor.process_pdf)
+
+    text_data = text_projection(results)
+    logger.info(
+        "Text extraction completed successfully. %s words extracted",
+        text_data["metadata"]["word_count"],
+    )
+
+    return {"success": True, "text": text_data, "filename": filename}
+
+
+@app.route("/extract-tables", methods=["POST"])
+@pdf_endpoint("EXTRACT TABLES")
+def extract_tables_only(path, filename):
+    """Extract only tables, skipping Document AI when the PDF has none"""
+    logger.info("Starting table extraction for: %s", filename)
+
+    results = cached_process(path, prescan_tables)
+    if results is None:
+        results = cached_process(path, chunked_processor.process_pdf)
+
+    tables_data = tables_projection(results)
+    logger.info(
+        "Table extraction completed successfully. Found %s tables",
+        len(tables_data["tables"]),
+    )
+
+    return {"success": True, "tables": tables_data, "filename": filename}
+
+
+@app.route("/extract-chunked", methods=["POST"])
+@pdf_endpoint("CHUNKED EXTRACT")
+def extract_pdf_chunked(path, filename):
+    """Force chunked processing for large PDFs"""
+    logger.info("Starting forced chunked processing for: %s", filename)
+    results = cached_process(path, chunked_processor.process_large_pdf)
+    logger.info("Chunked processing completed successfully")
+
+    return {"success": True, "data": results, "filename": filename}
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Status and result of a job queued with ?async=true"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify(job)
 
 
 if __name__ == "__main__":
@@ -341,9 +533,9 @@ if __name__ == "__main__":
     Config.create_directories()
 
     # Start the Flask app
+    # Development server only; production runs gunicorn -c gunicorn.conf.py
     port = int(os.getenv("PORT", 5001))
     host = os.getenv("HOST", "0.0.0.0")
-    debug = os.getenv("DEBUG", "False").lower() == "true"
 
-    logger.info(f"Starting Flask PDF Extractor service on {host}:{port}")
-    app.run(host=host, port=port, debug=debug)
+    logger.info("Starting Flask PDF Extractor service on %s:%s", host, port)
+    app.run(host=host, port=port, debug=Config.DEBUG)
@@ -4,7 +4,10 @@ Processes large PDFs by chunking and merging results
 """
 
 import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Dict, Any, List
 from pdf_chunker import PDFChunker
 from services.pdf_extractor import PDFExtractor
@@ -12,24 +15,42 @@ from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# First retry waits this long; each further retry doubles it
+RETRY_BACKOFF_SECONDS = 1.0
+
 
 class ChunkedPDFProcessor:
     """Processes large PDFs using chunking + Document AI"""
 
-    def __init__(self, chunk_size: int = None):
+    def __init__(
+        self,
+        chunk_size: int = None,
+        max_parallel_chunks: int = None,
+        pdf_extractor: PDFExtractor = None,
+    ):
         """
         Initialize chunked PDF processor
 
         Args:
             chunk_size: Number of pages per chunk (defaults to MAX_PAGES_PER_REQUEST from config)
+            max_parallel_chunks: Chunks sent to Document AI at once (defaults to MAX_PARALLEL_CHUNKS from config)
+            pdf_extractor: Extractor to reuse (defaults to a new PDFExtractor)
         """
         # Get chunk size from environment or use default
         if chunk_size is None:
             chunk_size = Config.MAX_PAGES_PER_REQUEST
+        if max_parallel_chunks is None:
+            max_parallel_chunks = Config.MAX_PARALLEL_CHUNKS
 
         self.chunker = PDFChunker(chunk_size=chunk_size)
-        self.pdf_extractor = PDFExtractor()
-        logger.info(f"ChunkedPDFProcessor initialized with chunk_size={chunk_size}")
+        self.pdf_extractor = pdf_extractor or PDFExtractor()
+        self.max_parallel_chunks = max(1, max_parallel_chunks)
+        self.max_attempts = max(1, Config.CHUNK_MAX_ATTEMPTS)
+        logger.info(
+            "ChunkedPDFProcessor initialized with chunk_size=%s, max_parallel_chunks=%s",
+            chunk_size,
+            self.max_parallel_chunks,
+        )
 
     def process_large_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -41,72 +62,178 @@ class ChunkedPDFProcessor:
         Returns:
             Complete document results
         """
-        try:
-            logger.info(f"Starting chunked processing for: {pdf_path}")
+        logger.info("Starting chunked processing for: %s", pdf_path)
 
-            # Step 1: Chunk the PDF
-            chunks = self.chunker.chunk_pdf(pdf_path)
-            logger.info(f"PDF split into {len(chunks)} chunks")
+        # Step 1: Chunk the PDF
+        chunks = self.chunker.chunk_pdf(pdf_path)
+        logger.info("PDF split into %s chunks", len(chunks))
 
-            # Step 2: Process each chunk with Document AI
-            chunk_results = []
+        return self._process_large_pdf_with_chunks(pdf_path, chunks)
 
-            for chunk in chunks:
-                logger.info(
-                    f"Processing chunk {chunk['chunk_id']}: pages {chunk['start_page']}-{chunk['end_page']}"
-                )
+    def _process_large_pdf_with_chunks(
+        self, pdf_path: str, chunks: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Process already-written chunks and merge their results
 
-                try:
-                    # Process chunk with Document AI
-                    chunk_result = self.pdf_extractor.extract_from_pdf(
-                        chunk["file_path"]
-                    )
-
-                    # Add chunk metadata
-                    chunk_results.append(
-                        {
-                            "chunk_id": chunk["chunk_id"],
-                            "success": True,
-                            "data": chunk_result,
-                            "chunk_info": chunk,
-                        }
-                    )
-
-                    logger.info(f"Chunk {chunk['chunk_id']} processed successfully")
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing chunk {chunk['chunk_id']}: {str(e)}"
-                    )
-                    chunk_results.append(
-                        {
-                            "chunk_id": chunk["chunk_id"],
-                            "success": False,
-                            "error": str(e),
-                            "chunk_info": chunk,
-                        }
-                    )
+        Args:
+            pdf_path: Path to the original PDF file
+            chunks: Chunk info dictionaries from chunk_pdf
+
+        Returns:
+            Complete document results
+        """
+        try:
+            # Step 2: Process chunks with Document AI concurrently
+            if Config.GCS_STAGING_BUCKET and len(chunks) >= Config.BATCH_API_THRESHOLD:
+                chunk_results = self._process_chunks_batch(chunks)
+            else:
+                chunk_results = self._process_chunks(chunks)
 
             # Step 3: Merge results
             logger.info("Merging results from all chunks")
             merged_result = self.chunker.merge_results(chunk_results)
 
-            # Step 4: Cleanup temporary files
-            logger.info("Cleaning up temporary chunk files")
-            self.chunker.cleanup_chunks(chunks)
-
             # Add processing metadata
             merged_result["metadata"]["processing_method"] = "chunked_document_ai"
             merged_result["metadata"]["original_file"] = pdf_path
             merged_result["metadata"]["chunks_created"] = len(chunks)
 
-            logger.info(f"Chunked processing completed successfully")
+            logger.info("Chunked processing completed successfully")
             return merged_result
 
         except Exception as e:
-            logger.error(f"Error in chunked processing: {str(e)}")
+            logger.error("Error in chunked processing: %s", e)
             raise
 
+    def _process_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process chunks concurrently, at most max_parallel_chunks at a time
+
+        Args:
+            chunks: List of chunk info dictionaries
+
+        Returns:
+            Chunk results in the same order as chunks
+        """
+        if len(chunks) == 1:
+            return [self._process_one_chunk(chunks[0])]
+
+        # Document AI calls are network-bound, so threads overlap them fine;
+        # the shared client is thread-safe. The async client is not used:
+        # its channel is bound to one event loop, so every request would pay
+        # for a new client, and concurrency is capped by max_parallel_chunks
+        # and the Document AI rate limiter long before thread count matters
+        workers = min(len(chunks), self.max_parallel_chunks)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pdf-chunk"
+        ) as executor:
+            futures = [
+                executor.submit(self._process_one_chunk, chunk) for chunk in chunks
+            ]
+            # Collect positionally so merge_results sees chunks in page order
+            return [future.result() for future in futures]
+
+    def _process_chunks_batch(
+        self, chunks: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Process chunks with a single Document AI batch request
+
+        Chunks the batch could not process, or all of them if the batch
+        request itself fails, are sent individually instead. A batch that
+        times out is not retried: the caller has already given up.
+
+        Args:
+            chunks: List of chunk info dictionaries
+
+        Returns:
+            Chunk results in the same order as chunks
+        """
+        try:
+            batch_results = self.pdf_extractor.extract_batch(
+                [chunk.get("content") or chunk["file_path"] for chunk in chunks]
+            )
+        except FutureTimeoutError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Batch processing failed, processing chunks individually: %s", e
+            )
+            return self._process_chunks(chunks)
+
+        failed = [chunk for chunk, data in zip(chunks, batch_results) if data is None]
+        retried = iter(self._process_chunks(failed) if failed else [])
+
+        chunk_results = []
+        for chunk, data in zip(chunks, batch_results):
+            if data is None:
+                chunk_results.append(next(retried))
+            else:
+                chunk_results.append(
+                    {
+                        "chunk_id": chunk["chunk_id"],
+                        "success": True,
+                        "data": data,
+                        "chunk_info": chunk,
+                    }
+                )
+        return chunk_results
+
+    def _process_one_chunk(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a single chunk with Document AI, retrying with exponential backoff
+
+        Args:
+            chunk: Chunk info dictionary
+
+        Returns:
+            Chunk result dict with success flag and data or error
+        """
+        logger.info(
+            "Processing chunk %s: pages %s-%s",
+            chunk["chunk_id"],
+            chunk["start_page"],
+            chunk["end_page"],
+        )
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                # Process chunk with Document AI
+                chunk_result = self.pdf_extractor.extract_from_pdf(
+                    chunk.get("content") or chunk["file_path"]
+                )
+                logger.info("Chunk %s processed successfully", chunk["chunk_id"])
+
+                # Add chunk metadata
+                return {
+                    "chunk_id": chunk["chunk_id"],
+                    "success": True,
+                    "data": chunk_result,
+                    "chunk_info": chunk,
+                }
+
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    logger.error("Error processing chunk %s: %s", chunk["chunk_id"], e)
+                    return {
+                        "chunk_id": chunk["chunk_id"],
+                        "success": False,
+                        "error": str(e),
+                        "chunk_info": chunk,
+                    }
+
+                delay = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.warning(
+                    "Chunk %s failed (attempt %s/%s): %s. Retrying in %.0fs",
+                    chunk["chunk_id"],
+                    attempt,
+                    self.max_attempts,
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+
     def process_small_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """
         Process a small PDF directly (no chunking needed)
@@ -118,7 +245,7 @@ class ChunkedPDFProcessor:
             Document results
         """
         try:
-            logger.info(f"Processing small PDF directly: {pdf_path}")
+            logger.info("Processing small PDF directly: %s", pdf_path)
             result = self.pdf_extractor.extract_from_pdf(pdf_path)
 
             # Add processing metadata
@@ -128,7 +255,7 @@ class ChunkedPDFProcessor:
             return result
 
         except Exception as e:
-            logger.error(f"Error processing small PDF: {str(e)}")
+            logger.error("Error processing small PDF: %s", e)
             raise
 
     def process_pdf(self, pdf_path: str) -> Dict[str, Any]:
@@ -142,7 +269,7 @@ class ChunkedPDFProcessor:
             Complete document results
         """
         try:
-            logger.info(f"Starting smart processing for: {pdf_path}")
+            logger.info("Starting smart processing for: %s", pdf_path)
 
             # Check if PDF needs chunking
             chunks = self.chunker.chunk_pdf(pdf_path)
@@ -152,12 +279,12 @@ class ChunkedPDFProcessor:
                 logger.info("PDF is small, processing directly")
                 return self.process_small_pdf(pdf_path)
             else:
-                # Large PDF - process with chunking
+                # Large PDF - reuse the chunks built above
                 logger.info("PDF is large, processing with chunking")
-                return self.process_large_pdf(pdf_path)
+                return self._process_large_pdf_with_chunks(pdf_path, chunks)
 
         except Exception as e:
-            logger.error(f"Error in smart processing: {str(e)}")
+            logger.error("Error in smart processing: %s", e)
             raise
 
 
@@ -4,14 +4,27 @@ Document AI to Markdown Converter
 Extracted from docai_to_markdown-3.py for integration with Flask API
 """
 
+import bisect
+import io
 import math
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, TextIO, Tuple
+
+_RE_HYPHEN_BREAK = re.compile(r"(\w)-\n(\w)")
+_RE_MULTI_BLANK = re.compile(r"\n{3,}")
+# bytes.translate deletion sets for counting ASCII letters in C
+_NON_ASCII_LETTERS = bytes(b for b in range(256) if not chr(b).isalpha() or b > 127)
+_NON_ASCII_UPPER = bytes(b for b in range(256) if not 65 <= b <= 90)
+_BULLET_PREFIXES = ("• ", "· ", "- ", "* ")
+# Padding for ragged table rows; shared by every table, so never mutate it
+_EMPTY_CELL = {"text": "", "rowSpan": 1, "colSpan": 1}
 
 
 def _get(d: Dict[str, Any], *keys, default=None):
+    if not isinstance(d, dict):
+        return default
     for k in keys:
-        if isinstance(d, dict) and k in d:
+        if k in d:
             return d[k]
     return default
 
@@ -25,13 +38,24 @@ def _segments(anchor: Dict[str, Any]) -> List[Tuple[int, int]]:
     if not anchor:
         return []
     segs = _get(anchor, "textSegments", "text_segments", default=[]) or []
+    if not segs:
+        return []
+    # All segments of a document share one key style; pick it once per anchor
+    # instead of trying both spellings for every segment. MessageToDict drops
+    # zero-valued fields, so a {} segment says nothing about the style: decide
+    # from the first segment that has keys
+    start_key, end_key = "start_index", "end_index"
+    for s in segs:
+        if s:
+            if "endIndex" in s or "startIndex" in s:
+                start_key, end_key = "startIndex", "endIndex"
+            break
     out = []
     for s in segs:
-        a = _get(s, "startIndex", "start_index", default=0) or 0
-        b = _get(s, "endIndex", "end_index", default=None)
+        b = s.get(end_key)
         if b is None:
             continue
-        out.append((int(a), int(b)))
+        out.append((int(s.get(start_key) or 0), int(b)))
     return out
 
 
@@ -62,38 +86,41 @@ def _union_segments(
 
 
 def _subtract_intervals(
-    include: List[Tuple[int, int]], exclude: List[Tuple[int, int]]
+    include: List[Tuple[int, int]],
+    exc_starts: List[int],
+    exc_ends: List[int],
 ) -> List[Tuple[int, int]]:
+    # exclusions must already be merged (sorted, non-overlapping) and split
+    # into parallel start/end lists, built once per page
     if not include:
         return []
-    if not exclude:
+    if not exc_starts:
         return include[:]
-    exc = _merge_intervals(exclude)
     out = []
+    n = len(exc_starts)
     for s, e in include:
         cur = s
-        for xs, xe in exc:
-            if xe <= cur:  # exclusion before cur
-                continue
-            if xs >= e:  # exclusion after this include
-                break
+        # merged intervals have increasing ends; skip those ending before cur
+        i = bisect.bisect_right(exc_ends, cur)
+        while i < n and exc_starts[i] < e:
+            xs = exc_starts[i]
             if xs > cur:  # keep left piece
                 out.append((cur, xs))
-            cur = max(cur, xe)  # jump right
+            cur = max(cur, exc_ends[i])  # jump right
             if cur >= e:
                 break
+            i += 1
         if cur < e:
             out.append((cur, e))
     return out
 
 
 def _text_from_segments(full_text: str, segs: List[Tuple[int, int]]) -> str:
-    parts = []
-    for s, e in segs:
-        s = max(0, min(len(full_text), s))
-        e = max(0, min(len(full_text), e))
-        parts.append(full_text[s:e])
-    return "".join(parts)
+    # slicing already clamps indices past the end; only negatives need care
+    if len(segs) == 1:
+        s, e = segs[0]
+        return full_text[max(0, s) : max(0, e)]
+    return "".join(full_text[max(0, s) : max(0, e)] for s, e in segs)
 
 
 def _norm_vertices(poly: Dict[str, Any]) -> List[Tuple[float, float]]:
@@ -117,11 +144,19 @@ def _bbox_from_layout(layout: Dict[str, Any]) -> Tuple[float, float, float, floa
     pts = _norm_vertices(poly)
     if not pts:
         return (math.inf, math.inf, -math.inf, -math.inf)
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
+    xs, ys = zip(*pts)
     return (min(xs), min(ys), max(xs), max(ys))  # (x1,y1,x2,y2)
 
 
+def _extract_layout(
+    layout: Dict[str, Any], full_text: str
+) -> Tuple[str, List[Tuple[int, int]], Tuple[float, float, float, float]]:
+    # (text, segs, bbox) of a layout in one pass
+    segs = _layout_segments(layout)
+    text = _text_from_segments(full_text, segs) if segs else ""
+    return text, segs, _bbox_from_layout(layout)
+
+
 def _center_x(box):
     return (box[0] + box[2]) / 2.0
 
@@ -136,9 +171,9 @@ def _cleanup_text(s: str) -> str:
     # Normalize whitespace, keep line breaks
     s = s.replace("\r", "")
     # Join hyphenation line-breaks: "exam-\nple" -> "example"
-    s = re.sub(r"(\w)-\n(\w)", r"\1\2", s)
+    s = _RE_HYPHEN_BREAK.sub(r"\1\2", s)
     # Collapse excessive blank lines
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = _RE_MULTI_BLANK.sub("\n\n", s)
     return s.strip()
 
 
@@ -149,10 +184,12 @@ def _is_heading_like(line: str) -> bool:
         return False
     if line.endswith("."):
         return False
-    letters = re.sub(r"[^A-Za-z]", "", line)
+    # only ASCII letters count, so non-ASCII characters can be dropped up front
+    raw = line.encode("ascii", "ignore")
+    letters = len(raw.translate(None, _NON_ASCII_LETTERS))
     if not letters:
         return False
-    upper_ratio = sum(1 for ch in letters if ch.isupper()) / max(1, len(letters))
+    upper_ratio = len(raw.translate(None, _NON_ASCII_UPPER)) / letters
     if upper_ratio >= 0.85:
         return True
     # Title Case & short
@@ -166,17 +203,14 @@ def _table_to_renderable(table: Dict[str, Any], full_text: str):
     body_rows = _get(table, "bodyRows", "body_rows", default=[]) or []
     any_span = False
     rows = []
-    all_spans = []
-    bbox = (math.inf, math.inf, -math.inf, -math.inf)
+    all_segs = []
+    boxes = []
 
     def cell_info(c):
-        layout = _get(c, "layout", default=c)
-        segs = _layout_segments(layout)
-        txt = _escape_md(_text_from_segments(full_text, segs))
+        text, segs, box = _extract_layout(_get(c, "layout", default=c), full_text)
         rspan = int(_get(c, "rowSpan", "row_span", default=1) or 1)
         cspan = int(_get(c, "colSpan", "col_span", default=1) or 1)
-        box = _bbox_from_layout(layout)
-        return txt, rspan, cspan, segs, box
+        return _escape_md(text), rspan, cspan, segs, box
 
     # collect rows
     for r in header_rows + body_rows:
@@ -186,14 +220,23 @@ def _table_to_renderable(table: Dict[str, Any], full_text: str):
             if rspan > 1 or cspan > 1:
                 any_span = True
             r_cells.append({"text": txt, "rowSpan": rspan, "colSpan": cspan})
-            all_spans = _union_segments(all_spans, segs)
-            bbox = _merge_bbox(bbox, box)
+            all_segs.extend(segs)
+            boxes.append(box)
         rows.append(r_cells)
 
+    # one merge and one bbox reduction for the whole table, not one per cell
+    all_spans = _merge_intervals(all_segs)
+    if boxes:
+        x1s, y1s, x2s, y2s = zip(*boxes)
+        bbox = (min(x1s), min(y1s), max(x2s), max(y2s))
+    else:
+        bbox = (math.inf, math.inf, -math.inf, -math.inf)
+
     # normalize widths for markdown (ignore spans)
     width = max((len(r) for r in rows), default=0)
     for r in rows:
-        r += [{"text": "", "rowSpan": 1, "colSpan": 1}] * (width - len(r))
+        if len(r) < width:
+            r.extend([_EMPTY_CELL] * (width - len(r)))
 
     return {"rows": rows, "any_span": any_span, "bbox": bbox, "segs": all_spans}
 
@@ -213,11 +256,22 @@ def _render_table_md(tbl) -> List[str]:
         header = [f"Col {i + 1}" for i in range(len(header))]
     lines.append("| " + " | ".join(header) + " |")
     lines.append("| " + " | ".join(["---"] * len(header)) + " |")
-    for r in rows[1:]:
-        lines.append("| " + " | ".join(c["text"] for c in r) + " |")
+    # join() builds a list from a generator anyway; pass it one directly
+    lines.extend(["| " + " | ".join([c["text"] for c in r]) + " |" for r in rows[1:]])
     return lines
 
 
+def _fmt_span_cell(tag: str, c) -> str:
+    cs, rs, t = c["colSpan"], c["rowSpan"], c["text"]
+    attrs = []
+    if cs > 1:
+        attrs.append(f'colspan="{cs}"')
+    if rs > 1:
+        attrs.append(f'rowspan="{rs}"')
+    attr = (" " + " ".join(attrs)) if attrs else ""
+    return f"      <{tag}{attr}>{t}</{tag}>"
+
+
 def _render_table_html(tbl) -> List[str]:
     """HTML table with support for rowSpan/colSpan."""
     lines = ["<table>"]
@@ -226,28 +280,33 @@ def _render_table_html(tbl) -> List[str]:
         # header guess: first row
         lines.append("  <thead>")
         lines.append("    <tr>")
-        for c in rows[0]:
-            attrs = []
-            if c["colSpan"] > 1:
-                attrs.append(f'colspan="{c["colSpan"]}"')
-            if c["rowSpan"] > 1:
-                attrs.append(f'rowspan="{c["rowSpan"]}"')
-            attr = (" " + " ".join(attrs)) if attrs else ""
-            lines.append(f"      <th{attr}>{c['text']}</th>")
+        lines.extend(
+            [
+                (
+                    f"      <th>{c['text']}</th>"
+                    if c["colSpan"] == 1 and c["rowSpan"] == 1
+                    else _fmt_span_cell("th", c)
+                )
+                for c in rows[0]
+            ]
+        )
         lines.append("    </tr>")
         lines.append("  </thead>")
         if len(rows) > 1:
             lines.append("  <tbody>")
             for r in rows[1:]:
                 lines.append("    <tr>")
-                for c in r:
-                    attrs = []
-                    if c["colSpan"] > 1:
-                        attrs.append(f'colspan="{c["colSpan"]}"')
-                    if c["rowSpan"] > 1:
-                        attrs.append(f'rowspan="{c["rowSpan"]}"')
-                    attr = (" " + " ".join(attrs)) if attrs else ""
-                    lines.append(f"      <td{attr}>{c['text']}</td>")
+                # unspanned cells, the common case, skip the attribute logic
+                lines.extend(
+                    [
+                        (
+                            f"      <td>{c['text']}</td>"
+                            if c["colSpan"] == 1 and c["rowSpan"] == 1
+                            else _fmt_span_cell("td", c)
+                        )
+                        for c in r
+                    ]
+                )
                 lines.append("    </tr>")
             lines.append("  </tbody>")
     lines.append("</table>")
@@ -265,10 +324,12 @@ def _fields_to_groups(
     def field_tuple(ff):
         name = _get(ff, "fieldName", "field_name", default={})
         value = _get(ff, "fieldValue", "field_value", default={})
-        nlay = _get(name, "layout", default=name)
-        vlay = _get(value, "layout", default=value)
-        nbox = _bbox_from_layout(nlay)
-        vbox = _bbox_from_layout(vlay)
+        ntext, nsegs, nbox = _extract_layout(
+            _get(name, "layout", default=name), full_text
+        )
+        vtext, vsegs, vbox = _extract_layout(
+            _get(value, "layout", default=value), full_text
+        )
 
         ymid = (
             ((vbox[1] + vbox[3]) / 2.0)
@@ -277,12 +338,12 @@ def _fields_to_groups(
         )
         xleft = min(nbox[0], vbox[0])
 
-        k = _escape_md(_text_from_segments(full_text, _layout_segments(nlay)))
-        v = _escape_md(_text_from_segments(full_text, _layout_segments(vlay)))
+        k = _escape_md(ntext)
+        v = _escape_md(vtext)
         if k.endswith(":"):
             k = k[:-1].rstrip()
 
-        segs = _union_segments(_layout_segments(nlay), _layout_segments(vlay))
+        segs = _union_segments(nsegs, vsegs)
         bbox = _merge_bbox(nbox, vbox)
         return dict(y=ymid, x=xleft, key=k, val=v, segs=segs, bbox=bbox)
 
@@ -293,30 +354,22 @@ def _fields_to_groups(
     groups = []
     cur = None
     for t in tuples:
-        if cur is None:
-            cur = {
-                "rows": [(t["key"], t["val"])],
-                "segs": t["segs"],
-                "bbox": t["bbox"],
-                "y": t["y"],
-                "x": t["x"],
-            }
-            continue
-        if abs(t["y"] - cur["y"]) <= row_threshold:
+        if cur is not None and abs(t["y"] - cur["y"]) <= row_threshold:
             cur["rows"].append((t["key"], t["val"]))
-            cur["segs"] = _union_segments(cur["segs"], t["segs"])
+            cur["segs"].extend(t["segs"])
             cur["bbox"] = _merge_bbox(cur["bbox"], t["bbox"])
-        else:
-            groups.append(cur)
-            cur = {
-                "rows": [(t["key"], t["val"])],
-                "segs": t["segs"],
-                "bbox": t["bbox"],
-                "y": t["y"],
-                "x": t["x"],
-            }
-    if cur:
+            continue
+        cur = {
+            "rows": [(t["key"], t["val"])],
+            "segs": list(t["segs"]),
+            "bbox": t["bbox"],
+            "y": t["y"],
+            "x": t["x"],
+        }
         groups.append(cur)
+    # merge each group's segments once rather than once per added field
+    for g in groups:
+        g["segs"] = _merge_intervals(g["segs"])
     groups.sort(key=lambda g: (g["y"], g["x"]))
     return groups
 
@@ -330,13 +383,13 @@ def _maybe_two_columns(
     """
     if len(items) < 6:  # too few to decide
         return (False, 0.5)
-    xs = sorted(_center_x(it["bbox"]) for it in items if "bbox" in it)
-    gaps = [(xs[i + 1] - xs[i], i) for i in range(len(xs) - 1)]
+    xs = sorted([_center_x(it["bbox"]) for it in items if "bbox" in it])
+    gaps = [b - a for a, b in zip(xs, xs[1:])]
     if not gaps:
         return (False, 0.5)
-    biggest_gap, idx = max(gaps, key=lambda g: g[0])
+    idx = max(range(len(gaps)), key=gaps.__getitem__)
     # If the biggest gap is wide, split between xs[idx] and xs[idx+1]
-    if biggest_gap >= col_gap_threshold:
+    if gaps[idx] >= col_gap_threshold:
         split_x = (xs[idx] + xs[idx + 1]) / 2.0
         return (True, split_x)
     return (False, 0.5)
@@ -347,6 +400,156 @@ def _assign_column(it, split_x: float) -> int:
     return 0 if cx <= split_x else 1
 
 
+def _render_page(
+    p_idx: int,
+    page: Dict[str, Any],
+    full_text: str,
+    kv_row_threshold: float,
+    col_gap_threshold: float,
+    include_kv_header: bool,
+    label_tables: bool,
+    header_heuristics: bool,
+    debug_spans: bool,
+) -> List[str]:
+    """Markdown lines for one page; pages are rendered independently."""
+    tables = _get(page, "tables", "tables", default=[]) or []
+    form_fields = _get(page, "formFields", "form_fields", default=[]) or []
+
+    # Prefer blocks; fallback to paragraphs; fallback to lines
+    blocks = _get(page, "blocks", default=None)
+    paragraphs = _get(page, "paragraphs", default=None)
+    lines = _get(page, "lines", default=None)
+    text_containers = (
+        blocks
+        if isinstance(blocks, list)
+        else (paragraphs if isinstance(paragraphs, list) else (lines or []))
+    )
+
+    items = []
+    consumed_raw = []
+
+    # tables
+    tcount = 0
+    for t in tables:
+        tinfo = _table_to_renderable(t, full_text)
+        titem = {
+            "type": "table",
+            "rows": tinfo["rows"],
+            "any_span": tinfo["any_span"],
+            "bbox": tinfo["bbox"],
+            "y": tinfo["bbox"][1],
+            "x": tinfo["bbox"][0],
+            "segs": tinfo["segs"],
+            "label_index": tcount,
+        }
+        items.append(titem)
+        consumed_raw.extend(tinfo["segs"])
+        tcount += 1
+
+    # kv groups
+    kv_groups = _fields_to_groups(form_fields, full_text, kv_row_threshold)
+    for g in kv_groups:
+        items.append(
+            {
+                "type": "kv",
+                "rows": g["rows"],
+                "bbox": g["bbox"],
+                "y": g["y"],
+                "x": g["x"],
+                "segs": g["segs"],
+            }
+        )
+        consumed_raw.extend(g["segs"])
+
+    # text containers (residual text)
+    consumed = _merge_intervals(consumed_raw)
+    exc_starts = [xs for xs, _ in consumed]
+    exc_ends = [xe for _, xe in consumed]
+    for c in text_containers:
+        lay = _get(c, "layout", default=c)
+        segs = _layout_segments(lay)
+        residual = _subtract_intervals(segs, exc_starts, exc_ends)
+        if not residual:
+            continue
+        text = _text_from_segments(full_text, residual)
+        text = _cleanup_text(text)
+        if not text.strip():
+            continue
+        bbox = _bbox_from_layout(lay)
+        items.append(
+            {
+                "type": "text",
+                "text": text,
+                "bbox": bbox,
+                "y": bbox[1],
+                "x": bbox[0],
+                "segs": residual,
+            }
+        )
+
+    # Two-column ordering (only affects text + kv; tables remain by bbox)
+    # We consider all items; if two columns detected, sort by (col, y, x)
+    two_col, split_x = _maybe_two_columns(
+        [it for it in items if "bbox" in it], col_gap_threshold
+    )
+
+    # final sort
+    if two_col:
+        items.sort(
+            key=lambda it: (
+                _assign_column(it, split_x),
+                round(it["y"], 4),
+                round(it["x"], 4),
+            )
+        )
+    else:
+        items.sort(key=lambda it: (round(it["y"], 4), round(it["x"], 4)))
+
+    # render page
+    md = [f"\n## Page {p_idx}\n"]
+    for it in items:
+        if it["type"] == "text":
+            # Bullet detection (per line)
+            out_lines = []
+            for ln in it["text"].splitlines():
+                s = ln.strip()
+                if not s:
+                    out_lines.append("")
+                    continue
+                if s.startswith(_BULLET_PREFIXES):
+                    out_lines.append("- " + s.lstrip("•·*- ").strip())
+                elif header_heuristics and _is_heading_like(s):
+                    out_lines.append(f"### {s}")
+                else:
+                    out_lines.append(s)
+            md.append("\n".join(out_lines) + "\n")
+            if debug_spans:
+                md.append(f"<!-- spans: {it['segs']} -->")
+        elif it["type"] == "kv":
+            rows = it["rows"]
+            if not rows:
+                continue
+            if include_kv_header:
+                md.append("| Field | Value |")
+                md.append("|---|---|")
+            for k, v in rows:
+                md.append(f"| {_escape_md(k)} | {_escape_md(v)} |")
+            md.append("")
+            if debug_spans:
+                md.append(f"<!-- spans: {it['segs']} -->")
+        elif it["type"] == "table":
+            if label_tables:
+                md.append("### Table")
+            if it["any_span"]:
+                md += _render_table_html(it)
+            else:
+                md += _render_table_md(it)
+            md.append("")
+            if debug_spans:
+                md.append(f"<!-- spans: {it['segs']} -->")
+    return md
+
+
 def convert_document_ai_to_markdown(
     document_ai_json: Dict[str, Any],
     kv_row_threshold: float = 0.018,
@@ -373,150 +576,69 @@ def convert_document_ai_to_markdown(
     Returns:
         Markdown string
     """
+    buf = io.StringIO()
+    convert_document_ai_to_markdown_stream(
+        document_ai_json,
+        buf,
+        kv_row_threshold=kv_row_threshold,
+        col_gap_threshold=col_gap_threshold,
+        include_kv_header=include_kv_header,
+        label_tables=label_tables,
+        page_sep=page_sep,
+        header_heuristics=header_heuristics,
+        debug_spans=debug_spans,
+    )
+    return buf.getvalue()
+
+
+def convert_document_ai_to_markdown_stream(
+    document_ai_json: Dict[str, Any],
+    out: TextIO,
+    kv_row_threshold: float = 0.018,
+    col_gap_threshold: float = 0.18,
+    include_kv_header: bool = True,
+    label_tables: bool = False,
+    page_sep: bool = False,
+    header_heuristics: bool = True,
+    debug_spans: bool = False,
+) -> None:
+    """
+    Convert Document AI JSON response to Markdown, writing it to out page by
+    page so only one page's markdown is held in memory at a time.
+
+    Args:
+        document_ai_json: Document AI JSON response
+        out: Text stream the markdown is written to
+        kv_row_threshold: Vertical proximity to group KV rows
+        col_gap_threshold: Normalized x-gap to detect 2-column layout
+        include_kv_header: Include 'Field | Value' header for KV groups
+        label_tables: Add '### Table' label before each table
+        page_sep: Insert '---' between pages
+        header_heuristics: Enable heading heuristics in text blocks
+        debug_spans: Emit HTML comments with text span indices
+    """
     doc = _doc_obj(document_ai_json)
     pages = doc.get("pages", [])
     full_text = doc.get("text", "")
 
-    md = []
     title = _get(doc, "documentSchema", "document_schema", default={})
     title = _get(title, "displayName", "display_name", default="") or "Document"
-    md.append(f"# {_escape_md(title)}\n")
+    out.write(f"# {_escape_md(title)}\n")
 
     for p_idx, page in enumerate(pages, start=1):
-        tables = _get(page, "tables", "tables", default=[]) or []
-        form_fields = _get(page, "formFields", "form_fields", default=[]) or []
-
-        # Prefer blocks; fallback to paragraphs; fallback to lines
-        blocks = _get(page, "blocks", default=None)
-        paragraphs = _get(page, "paragraphs", default=None)
-        lines = _get(page, "lines", default=None)
-        text_containers = (
-            blocks
-            if isinstance(blocks, list)
-            else (paragraphs if isinstance(paragraphs, list) else (lines or []))
+        md = _render_page(
+            p_idx,
+            page,
+            full_text,
+            kv_row_threshold,
+            col_gap_threshold,
+            include_kv_header,
+            label_tables,
+            header_heuristics,
+            debug_spans,
         )
-
-        items = []
-        consumed = []
-
-        # tables
-        tcount = 0
-        for t in tables:
-            tinfo = _table_to_renderable(t, full_text)
-            titem = {
-                "type": "table",
-                "rows": tinfo["rows"],
-                "any_span": tinfo["any_span"],
-                "bbox": tinfo["bbox"],
-                "y": tinfo["bbox"][1],
-                "x": tinfo["bbox"][0],
-                "segs": tinfo["segs"],
-                "label_index": tcount,
-            }
-            items.append(titem)
-            consumed = _merge_intervals(consumed + tinfo["segs"])
-            tcount += 1
-
-        # kv groups
-        kv_groups = _fields_to_groups(form_fields, full_text, kv_row_threshold)
-        for g in kv_groups:
-            items.append(
-                {
-                    "type": "kv",
-                    "rows": g["rows"],
-                    "bbox": g["bbox"],
-                    "y": g["y"],
-                    "x": g["x"],
-                    "segs": g["segs"],
-                }
-            )
-            consumed = _merge_intervals(consumed + g["segs"])
-
-        # text containers (residual text)
-        for c in text_containers:
-            lay = _get(c, "layout", default=c)
-            segs = _layout_segments(lay)
-            residual = _subtract_intervals(segs, consumed)
-            if not residual:
-                continue
-            text = _text_from_segments(full_text, residual)
-            text = _cleanup_text(text)
-            if not text.strip():
-                continue
-            bbox = _bbox_from_layout(lay)
-            items.append(
-                {
-                    "type": "text",
-                    "text": text,
-                    "bbox": bbox,
-                    "y": bbox[1],
-                    "x": bbox[0],
-                    "segs": residual,
-                }
-            )
-
-        # Two-column ordering (only affects text + kv; tables remain by bbox)
-        # We consider all items; if two columns detected, sort by (col, y, x)
-        two_col, split_x = _maybe_two_columns(
-            [it for it in items if "bbox" in it], col_gap_threshold
-        )
-
-        # final sort
-        if two_col:
-            items.sort(
-                key=lambda it: (
-                    _assign_column(it, split_x),
-                    round(it["y"], 4),
-                    round(it["x"], 4),
-                )
-            )
-        else:
-            items.sort(key=lambda it: (round(it["y"], 4), round(it["x"], 4)))
-
-        # render page
-        md.append(f"\n## Page {p_idx}\n")
-        for it in items:
-            if it["type"] == "text":
-                # Bullet detection (per line)
-                out_lines = []
-                for ln in it["text"].splitlines():
-                    s = ln.strip()
-                    if not s:
-                        out_lines.append("")
-                        continue
-                    if s.startswith(("• ", "· ", "- ", "* ")):
-                        out_lines.append("- " + s.lstrip("•·*- ").strip())
-                    elif header_heuristics and _is_heading_like(s):
-                        out_lines.append(f"### {s}")
-                    else:
-                        out_lines.append(s)
-                md.append("\n".join(out_lines) + "\n")
-                if debug_spans:
-                    md.append(f"<!-- spans: {it['segs']} -->")
-            elif it["type"] == "kv":
-                rows = it["rows"]
-                if not rows:
-                    continue
-                if include_kv_header:
-                    md.append("| Field | Value |")
-                    md.append("|---|---|")
-                for k, v in rows:
-                    md.append(f"| {_escape_md(k)} | {_escape_md(v)} |")
-                md.append("")
-                if debug_spans:
-                    md.append(f"<!-- spans: {it['segs']} -->")
-            elif it["type"] == "table":
-                if label_tables:
-                    md.append("### Table")
-                if it["any_span"]:
-                    md += _render_table_html(it)
-                else:
-                    md += _render_table_md(it)
-                md.append("")
-                if debug_spans:
-                    md.append(f"<!-- spans: {it['segs']} -->")
-
         if page_sep and p_idx < len(pages):
             md.append("\n---\n")
 
-    return "\n".join(md)
+        out.write("\n")
+        out.write("\n".join(md))
@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the PDF extractor service
+Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+
+# Requests mostly wait on Document AI, so threads overlap that I/O inside each
+# worker; a couple of workers is enough. Caches, the job queue and the temp
+# file pool are per worker, so each extra worker multiplies their memory
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = 300
+
+# Import the app (config, credentials, Document AI token) once in the master
+# and fork workers from it. gRPC does not survive a fork, so nothing may open
+# a Document AI channel at import: each worker builds its client on its first
+# request. Temp files are recreated in each worker after the fork
+preload_app = True
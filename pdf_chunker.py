@@ -3,7 +3,6 @@ Simple PDF Chunker for Google Document AI
 Handles splitting large PDFs into processable chunks
 """
 
-import os
 import logging
 from typing import List, Dict, Any
 import fitz  # PyMuPDF
@@ -27,7 +26,7 @@ class PDFChunker:
             chunk_size = Config.MAX_PAGES_PER_REQUEST
 
         self.chunk_size = chunk_size
-        logger.info(f"PDFChunker initialized with chunk_size={chunk_size}")
+        logger.info("PDFChunker initialized with chunk_size=%s", chunk_size)
 
     def chunk_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
         """
@@ -37,70 +36,73 @@ class PDFChunker:
             pdf_path: Path to the PDF file
 
         Returns:
-            List of chunk info dictionaries
+            List of chunk info dictionaries; chunks of a split PDF carry
+            their PDF bytes under "content" instead of a file path
         """
         try:
-            logger.info(f"Starting PDF chunking for: {pdf_path}")
-
-            # Open PDF
-            doc = fitz.open(pdf_path)
-            total_pages = len(doc)
-
-            logger.info(f"PDF has {total_pages} pages")
-
-            if total_pages <= self.chunk_size:
-                logger.info("PDF is small enough, no chunking needed")
-                return [
-                    {
-                        "chunk_id": 0,
-                        "start_page": 1,
-                        "end_page": total_pages,
-                        "page_count": total_pages,
-                        "file_path": pdf_path,
-                        "is_chunked": False,
-                    }
-                ]
-
-            # Create chunks
-            chunks = []
-            chunk_id = 0
-
-            for start_page in range(0, total_pages, self.chunk_size):
-                end_page = min(start_page + self.chunk_size - 1, total_pages - 1)
-                page_count = end_page - start_page + 1
-
-                # Create chunk PDF
-                chunk_doc = fitz.open()
-                chunk_doc.insert_pdf(doc, from_page=start_page, to_page=end_page)
-
-                # Save chunk file
-                chunk_filename = f"chunk_{chunk_id}_{os.path.basename(pdf_path)}"
-                chunk_path = os.path.join(os.path.dirname(pdf_path), chunk_filename)
-                chunk_doc.save(chunk_path)
-                chunk_doc.close()
-
-                chunks.append(
-                    {
-                        "chunk_id": chunk_id,
-                        "start_page": start_page + 1,  # 1-indexed
-                        "end_page": end_page + 1,  # 1-indexed
-                        "page_count": page_count,
-                        "file_path": chunk_path,
-                        "is_chunked": True,
-                    }
-                )
-
-                logger.info(
-                    f"Created chunk {chunk_id}: pages {start_page + 1}-{end_page + 1} ({page_count} pages)"
-                )
-                chunk_id += 1
-
-            doc.close()
-            logger.info(f"PDF chunking completed: {len(chunks)} chunks created")
+            logger.info("Starting PDF chunking for: %s", pdf_path)
+
+            # Closed on every exit, including the early return below
+            with fitz.open(pdf_path) as doc:
+                total_pages = len(doc)
+
+                logger.info("PDF has %s pages", total_pages)
+
+                if total_pages <= self.chunk_size:
+                    logger.info("PDF is small enough, no chunking needed")
+                    return [
+                        {
+                            "chunk_id": 0,
+                            "start_page": 1,
+                            "end_page": total_pages,
+                            "page_count": total_pages,
+                            "file_path": pdf_path,
+                            "is_chunked": False,
+                        }
+                    ]
+
+                # Create chunks
+                chunks = []
+                chunk_id = 0
+
+                for start_page in range(0, total_pages, self.chunk_size):
+                    end_page = min(start_page + self.chunk_size - 1, total_pages - 1)
+                    page_count = end_page - start_page + 1
+
+                    # Keep the chunk in memory; Document AI takes raw bytes,
+                    # so writing it to disk and reading it back gains nothing
+                    with fitz.open() as chunk_doc:
+                        chunk_doc.insert_pdf(
+                            doc, from_page=start_page, to_page=end_page
+                        )
+                        content = chunk_doc.tobytes()
+
+                    chunks.append(
+                        {
+                            "chunk_id": chunk_id,
+                            "start_page": start_page + 1,  # 1-indexed
+                            "end_page": end_page + 1,  # 1-indexed
+                            "page_count": page_count,
+                            "file_path": None,
+                            "content": content,
+                            "is_chunked": True,
+                        }
+                    )
+
+                    logger.info(
+                        "Created chunk %s: pages %s-%s (%s pages)",
+                        chunk_id,
+                        start_page + 1,
+                        end_page + 1,
+                        page_count,
+                    )
+                    chunk_id += 1
+
+            logger.info("PDF chunking completed: %s chunks created", len(chunks))
             return chunks
 
         except Exception as e:
-            logger.error(f"Error chunking PDF: {str(e)}")
+            logger.error("Error chunking PDF: %s", e)
             raise
 
     def merge_results(self, chunk_results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -114,7 +116,7 @@ class PDFChunker:
             Merged document results
         """
         try:
-            logger.info(f"Merging results from {len(chunk_results)} chunks")
+            logger.info("Merging results from %s chunks", len(chunk_results))
 
             # Sort chunks by chunk_id to maintain order
             chunk_results.sort(key=lambda x: x.get("chunk_id", 0))
@@ -131,25 +133,24 @@ class PDFChunker:
             for chunk_result in chunk_results:
                 if not chunk_result.get("success", False):
                     logger.warning(
-                        f"Chunk {chunk_result.get('chunk_id', 'unknown')} failed, skipping"
+                        "Chunk %s failed, skipping",
+                        chunk_result.get("chunk_id", "unknown"),
                     )
                     continue
 
                 data = chunk_result.get("data", {})
 
-                # Merge pages
+                # Merge pages and tables, shifting page numbers to be
+                # sequential (the first chunk needs no shift)
                 pages = data.get("pages", [])
-                for page in pages:
-                    # Adjust page numbers to be sequential
-                    page["page_number"] = total_pages + page["page_number"]
-                    merged_pages.append(page)
-
-                # Merge tables
                 tables = data.get("tables", [])
-                for table in tables:
-                    # Adjust page numbers
-                    table["page_number"] = total_pages + table["page_number"]
-                    merged_tables.append(table)
+                if total_pages:
+                    for page in pages:
+                        page["page_number"] += total_pages
+                    for table in tables:
+                        table["page_number"] += total_pages
+                merged_pages.extend(pages)
+                merged_tables.extend(tables)
 
                 # Merge full_text
                 chunk_text = data.get("full_text", "")
@@ -200,34 +201,16 @@ class PDFChunker:
             }
 
             logger.info(
-                f"Results merged successfully: {total_pages} pages, {len(merged_tables)} tables, "
-                f"{len(merged_markdown)} markdown chunks, {len(merged_raw_text)} raw_text chunks, "
-                f"{len(merged_entities)} entities, {len(merged_form_fields)} form fields"
+                "Results merged successfully: %s pages, %s tables, %s markdown chunks, %s raw_text chunks, %s entities, %s form fields",
+                total_pages,
+                len(merged_tables),
+                len(merged_markdown),
+                len(merged_raw_text),
+                len(merged_entities),
+                len(merged_form_fields),
             )
             return merged_result
 
         except Exception as e:
-            logger.error(f"Error merging results: {str(e)}")
+            logger.error("Error merging results: %s", e)
             raise
-
-    def cleanup_chunks(self, chunks: List[Dict[str, Any]]) -> None:
-        """
-        Clean up temporary chunk files
-
-        Args:
-            chunks: List of chunk info dictionaries
-        """
-        try:
-            logger.info("Cleaning up temporary chunk files")
-
-            for chunk in chunks:
-                if chunk.get("is_chunked", False):
-                    chunk_path = chunk.get("file_path")
-                    if chunk_path and os.path.exists(chunk_path):
-                        os.remove(chunk_path)
-                        logger.info(f"Removed chunk file: {chunk_path}")
-
-            logger.info("Cleanup completed")
-
-        except Exception as e:
-            logger.error(f"Error during cleanup: {str(e)}")
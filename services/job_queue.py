@@ -0,0 +1,211 @@
+"""
+In-process job queue for PDF processing
+Runs jobs on a bounded worker pool and persists job state to disk so any
+worker process on the host can answer status requests
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds as many tasks as it accepts"""
+
+
+class JobQueue:
+    """Bounded worker pool with a file-backed job store"""
+
+    def __init__(
+        self,
+        max_workers: int,
+        jobs_folder: str,
+        result_ttl: int = 3600,
+        max_pending: int = None,
+    ):
+        """
+        Initialize job queue
+
+        Args:
+            max_workers: Number of jobs processed concurrently
+            jobs_folder: Directory where job state files are stored
+            result_ttl: Seconds to keep finished job results
+            max_pending: Tasks accepted at once, running or waiting
+                (defaults to max_workers)
+        """
+        if max_pending is None:
+            max_pending = max_workers
+
+        self.jobs_folder = jobs_folder
+        self.result_ttl = result_ttl
+        self.max_pending = max(max_workers, max_pending)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pdf-job"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+        os.makedirs(jobs_folder, exist_ok=True)
+        logger.info(
+            "JobQueue initialized with max_workers=%s, max_pending=%s",
+            max_workers,
+            self.max_pending,
+        )
+
+    def submit(self, fn: Callable[[], Dict[str, Any]]) -> str:
+        """
+        Queue a job for background execution
+
+        Args:
+            fn: Callable returning the JSON-serializable job result
+
+        Returns:
+            Job ID
+
+        Raises:
+            QueueFullError: If the queue is saturated
+        """
+        self._prune_expired()
+
+        job_id = uuid.uuid4().hex
+        self._save(job_id, {"job_id": job_id, "status": "queued"})
+        try:
+            self._submit(self._run, job_id, fn)
+        except QueueFullError:
+            os.unlink(self._path(job_id))
+            raise
+
+        logger.info("Queued job %s", job_id)
+        return job_id
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        timeout: float = None,
+        on_cancel: Callable[[], None] = None,
+    ) -> Any:
+        """
+        Execute fn on the worker pool and wait for its result
+
+        If fn has not started when the timeout expires it is dropped, so the
+        slot goes to a caller who is still waiting.
+
+        Args:
+            fn: Callable to execute
+            timeout: Seconds to wait for the result
+            on_cancel: Called instead of fn if fn is dropped
+
+        Returns:
+            Value returned by fn
+
+        Raises:
+            QueueFullError: If the queue is saturated
+            concurrent.futures.TimeoutError: If fn does not finish in time
+        """
+        future = self._submit(fn)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Only succeeds while fn is still waiting for a worker
+            if future.cancel():
+                logger.warning("Dropped a task that timed out before it started")
+                self._release()
+                if on_cancel:
+                    on_cancel()
+            raise
+
+    def is_full(self) -> bool:
+        """Check whether new tasks would currently be rejected"""
+        with self._lock:
+            return self._pending >= self.max_pending
+
+    def _submit(self, fn: Callable, *args: Any):
+        """Submit fn(*args) to the executor if a slot is free"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(
+                    "Too many PDFs are being processed, try again later"
+                )
+            self._pending += 1
+
+        def task():
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+
+        try:
+            return self.executor.submit(task)
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the current state of a job
+
+        Args:
+            job_id: Job ID returned by submit
+
+        Returns:
+            Job state dict, or None if the job is unknown
+        """
+        # Job IDs are uuid4 hex strings; reject anything else before touching disk
+        if len(job_id) != 32 or not job_id.isalnum():
+            return None
+
+        try:
+            with open(self._path(job_id), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _run(self, job_id: str, fn: Callable[[], Dict[str, Any]]) -> None:
+        """Execute a job and record its outcome"""
+        self._save(job_id, {"job_id": job_id, "status": "running"})
+
+        try:
+            result = fn()
+            self._save(
+                job_id, {"job_id": job_id, "status": "completed", "result": result}
+            )
+            logger.info("Job %s completed", job_id)
+        except Exception as e:
+            logger.error("Job %s failed: %s", job_id, e, exc_info=True)
+            self._save(job_id, {"job_id": job_id, "status": "failed", "error": str(e)})
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_folder, f"{job_id}.json")
+
+    def _save(self, job_id: str, state: Dict[str, Any]) -> None:
+        """Atomically write job state so readers never see partial JSON"""
+        state["updated_at"] = time.time()
+        tmp_path = f"{self._path(job_id)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._path(job_id))
+
+    def _prune_expired(self) -> None:
+        """Remove job files older than the result TTL"""
+        cutoff = time.time() - self.result_ttl
+        try:
+            for entry in os.scandir(self.jobs_folder):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    # Pruned concurrently by another worker
+                    pass
+        except OSError as e:
+            logger.warning("Error pruning expired jobs: %s", e)
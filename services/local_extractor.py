@@ -0,0 +1,152 @@
+"""
+Local extraction with PyMuPDF
+Reads the PDF's embedded text layer and page layout so born-digital documents
+can skip Document AI; scanned documents have little or no text layer and fall
+back
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import fitz  # PyMuPDF
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Share of U+FFFD characters above which the text layer is treated as garbled
+MAX_REPLACEMENT_CHAR_RATIO = 0.1
+
+# Pages handed to a worker process at a time
+PAGES_PER_TASK = 10
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # The app process is multi-threaded, so don't fork it directly
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.LOCAL_TEXT_WORKERS,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _executor
+
+
+def _extract_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Read the text of pages [start, end); runs in a worker process"""
+    # Documents can't be shared across processes, so each task opens its own
+    with fitz.open(pdf_path) as doc:
+        return [doc.load_page(i).get_text("text").strip() for i in range(start, end)]
+
+
+def _read_texts(pdf_path: str) -> List[str]:
+    """Read every page's text, spreading large documents over worker processes"""
+    with fitz.open(pdf_path) as doc:
+        total_pages = doc.page_count
+        if (
+            Config.LOCAL_TEXT_WORKERS < 2
+            or total_pages < Config.LOCAL_TEXT_PARALLEL_MIN_PAGES
+        ):
+            return [page.get_text("text").strip() for page in doc]
+
+    starts = range(0, total_pages, PAGES_PER_TASK)
+    ends = [min(start + PAGES_PER_TASK, total_pages) for start in starts]
+    ranges = _get_executor().map(_extract_range, [pdf_path] * len(ends), starts, ends)
+    return [text for texts in ranges for text in texts]
+
+
+def extract_text_layer(pdf_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract text from the PDF's text layer
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        Results in the same shape as ChunkedPDFProcessor.process_pdf, or None
+        if the text layer is too sparse or garbled to be trusted
+    """
+    texts = _read_texts(pdf_path)
+
+    total_pages = len(texts)
+    if total_pages == 0:
+        return None
+
+    total_chars = sum(len(text) for text in texts)
+    if total_chars / total_pages < Config.LOCAL_TEXT_MIN_CHARS_PER_PAGE:
+        logger.info(
+            "Text layer too sparse (%s chars over %s pages), using Document AI",
+            total_chars,
+            total_pages,
+        )
+        return None
+
+    replacement_chars = sum(text.count("\ufffd") for text in texts)
+    if replacement_chars / total_chars > MAX_REPLACEMENT_CHAR_RATIO:
+        logger.info("Text layer looks garbled, using Document AI")
+        return None
+
+    # Same keys as Document AI pages; the text layer has no per-paragraph
+    # layout, and embedded text is exact rather than recognized
+    pages = [
+        {
+            "page_number": page_num + 1,
+            "text": text,
+            "text_elements": [],
+            "word_count": len(text.split()),
+            "confidence": 1.0,
+        }
+        for page_num, text in enumerate(texts)
+    ]
+
+    return {
+        "pages": pages,
+        "full_text": "\n\n".join(texts),
+        "metadata": {
+            "total_pages": total_pages,
+            "extraction_method": "pymupdf_text_layer",
+            "processing_method": "local_text_layer",
+        },
+    }
+
+
+def prescan_tables(pdf_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Detect PDFs that certainly contain no tables without calling Document AI
+
+    Only short, born-digital PDFs qualify: every page must have a text layer
+    (a scanned table is just an image) and PyMuPDF's ruling-line detector must
+    find nothing on any page. Borderless tables are not detected, which is why
+    the pre-scan is opt-in (TABLE_PRESCAN_MAX_PAGES).
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        Empty table results in the same shape as ChunkedPDFProcessor.process_pdf,
+        or None if the PDF may contain tables
+    """
+    with fitz.open(pdf_path) as doc:
+        total_pages = doc.page_count
+        if total_pages == 0 or total_pages > Config.TABLE_PRESCAN_MAX_PAGES:
+            return None
+
+        for page in doc:
+            if not page.get_text("text").strip() or page.find_tables().tables:
+                return None
+
+    logger.info("No tables found by local pre-scan, skipping Document AI")
+    return {
+        "tables": [],
+        "metadata": {
+            "total_pages": total_pages,
+            "extraction_method": "pymupdf_table_prescan",
+            "processing_method": "local_table_prescan",
+        },
+    }
@@ -1,17 +1,159 @@
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 import os
 import json
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import google.auth
+import google.auth.transport.requests
 from google.cloud import documentai
+from google.cloud import storage
 from google.api_core import exceptions as gcp_exceptions
 from docai_converter import convert_document_ai_to_markdown
+from services.result_cache import ResultCache
+from utils.config import Config
+from utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Shared across extractor instances, and through the state file (next to the
+# temp file pool) across every gunicorn worker, so the host respects the quota
+_document_ai_limiter = RateLimiter(
+    Config.DOCUMENT_AI_MAX_RPS,
+    state_file=os.path.join(
+        tempfile.gettempdir(), "pdf-extractor", "document_ai_rate.lock"
+    ),
+)
+
+# Document AI responses by PDF content hash, so the same PDF (or the same
+# chunk of it) reaching different endpoints is only sent once. Entries are
+# serialized documents without page images, bounded in total bytes; the cache
+# is per worker process
+_document_cache = ResultCache(
+    maxsize=Config.DOCUMENT_CACHE_SIZE,
+    ttl=Config.RESULT_CACHE_TTL,
+    max_bytes=Config.DOCUMENT_CACHE_MAX_MB * 1024 * 1024,
+)
+
+# Document AI clients are expensive to build (credential lookup, token fetch,
+# gRPC channel), so one client per location is shared by the whole process
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# A batch request gives up this many seconds before REQUEST_TIMEOUT, leaving
+# time to fetch its outputs before a synchronous caller is answered with a 504
+BATCH_DEADLINE_MARGIN = 60
+_clients: Dict[str, Any] = {}
+_client_credentials: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+# Clients a forked child inherited; kept referenced so their channels are
+# never torn down in the child
+_inherited_clients: List[Any] = []
+
+
+def _reset_clients() -> None:
+    """Stop using clients inherited over fork; gRPC channels can't be shared"""
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    # Destroying an inherited channel touches the parent's gRPC state and can
+    # hang, so the child only sets the clients aside. None exist under
+    # gunicorn preload, as clients are built on the first request
+    _inherited_clients.extend(_clients.values())
+    _clients.clear()
+
+
+# Credentials (and their token) survive the fork, so a worker forked from a
+# preloaded app only builds the channel
+os.register_at_fork(after_in_child=_reset_clients)
+
+
+def _get_client(location: str, credentials: Any = None) -> Any:
+    """
+    Return the shared Document AI client, creating it on first use
+
+    Args:
+        location: Document AI location the client is built for
+        credentials: Credentials for a new client (defaults to
+            Application Default Credentials)
+
+    Returns:
+        Document AI client for the location
+    """
+    with _clients_lock:
+        client = _clients.get(location)
+        if client is None:
+            logger.info("Initializing Document AI client...")
+            credentials = _load_credentials(location, credentials)
+            client = documentai.DocumentProcessorServiceClient(credentials=credentials)
+            _clients[location] = client
+        return client
+
+
+def _load_credentials(location: str, credentials: Any = None) -> Any:
+    """
+    Return the shared credentials for a location, fetching their token
+
+    Only plain HTTP is used, so this is safe to call before workers fork.
+    Callers hold _clients_lock or run before any request threads start.
+
+    Args:
+        location: Document AI location the credentials are for
+        credentials: Credentials to use (defaults to the ones already loaded
+            for the location, then Application Default Credentials)
+
+    Returns:
+        Credentials with a fresh access token where one could be fetched
+    """
+    if credentials is None:
+        credentials = _client_credentials.get(location)
+    if credentials is None:
+        credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+
+    # Fetch the access token now; the credentials object keeps it
+    # cached until it is close to expiry
+    if not credentials.valid:
+        try:
+            credentials.refresh(google.auth.transport.requests.Request())
+        except Exception as e:
+            logger.warning("Could not pre-fetch access token: %s", e)
+
+    _client_credentials[location] = credentials
+    return credentials
+
+
+def _serialize_document(document: Any) -> bytes:
+    """
+    Serialize a Document AI document for the response cache
+
+    Page images are dropped: nothing downstream reads them and they are most
+    of the document's size.
+
+    Args:
+        document: Document AI document
+
+    Returns:
+        Serialized document without page images
+    """
+    document_pb = documentai.Document.pb(document)
+    for page in document_pb.pages:
+        page.ClearField("image")
+    return document_pb.SerializeToString()
+
 
 class PDFExtractor:
-    def __init__(self):
-        """Initialize PDF extractor with Google Document AI configuration"""
+    def __init__(self, credentials: Any = None):
+        """
+        Initialize PDF extractor with Google Document AI configuration
+
+        Args:
+            credentials: Google credentials for Document AI (defaults to
+                Application Default Credentials)
+        """
+        self.credentials = credentials
         self.project_id = os.getenv("GOOGLE_PROJECT_ID")
         self.location = os.getenv("GOOGLE_LOCATION", "us")  # Default to us
         self.processor_id = os.getenv("GOOGLE_PROCESSOR_ID")
@@ -25,21 +167,47 @@ class PDFExtractor:
             logger.error("- GOOGLE_LOCATION (optional, defaults to 'us')")
             raise ValueError("Google Cloud configuration incomplete")
 
-        logger.info(f"PDFExtractor initialized with Google Document AI")
+        self.processor_name = documentai.DocumentProcessorServiceClient.processor_path(
+            self.project_id, self.location, self.processor_id
+        )
+
+        # Warm the credentials and token only: the gRPC channel must not be
+        # opened here, as the app may be imported before gunicorn forks. The
+        # client is created on the first request instead
+        try:
+            _load_credentials(self.location, self.credentials)
+        except Exception as e:
+            logger.warning("Document AI credentials not loaded yet: %s", e)
+
+        logger.info("PDFExtractor initialized with Google Document AI")
         logger.info(
-            f"Project: {self.project_id}, Location: {self.location}, Processor: {self.processor_id}"
+            "Project: %s, Location: %s, Processor: %s",
+            self.project_id,
+            self.location,
+            self.processor_id,
         )
 
-    def extract_from_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_from_pdf(self, pdf_path: Union[str, bytes]) -> Dict[str, Any]:
         """
         Main extraction method using Google Document AI
+
+        Args:
+            pdf_path: Path to the PDF file, or the PDF's bytes
         """
         try:
-            logger.info(f"Starting Document AI extraction for: {pdf_path}")
-            logger.info(f"File exists: {os.path.exists(pdf_path)}")
-            logger.info(
-                f"File size: {os.path.getsize(pdf_path) if os.path.exists(pdf_path) else 'N/A'} bytes"
-            )
+            if isinstance(pdf_path, bytes):
+                logger.info(
+                    "Starting Document AI extraction for %s bytes", len(pdf_path)
+                )
+            else:
+                logger.info("Starting Document AI extraction for: %s", pdf_path)
+            # These stat the file, so skip them when INFO is filtered out
+            if isinstance(pdf_path, str) and logger.isEnabledFor(logging.INFO):
+                logger.info("File exists: %s", os.path.exists(pdf_path))
+                logger.info(
+                    "File size: %s bytes",
+                    os.path.getsize(pdf_path) if os.path.exists(pdf_path) else "N/A",
+                )
 
             # Process document with Document AI
             document = self._process_with_document_ai(pdf_path)
@@ -50,20 +218,20 @@ class PDFExtractor:
             # Extract structured data
             result = self._parse_document_ai_response(document)
 
-            logger.info(f"Document AI extraction completed successfully")
-            logger.info(f"Extracted {len(result.get('pages', []))} pages")
-            logger.info(f"Found {len(result.get('tables', []))} tables")
+            logger.info("Document AI extraction completed successfully")
+            logger.info("Extracted %s pages", len(result.get("pages", [])))
+            logger.info("Found %s tables", len(result.get("tables", [])))
 
             return result
 
         except Exception as e:
-            logger.error(f"Document AI extraction failed: {str(e)}", exc_info=True)
+            logger.error("Document AI extraction failed: %s", e, exc_info=True)
             raise
 
     def extract_text_only(self, pdf_path: str) -> Dict[str, Any]:
         """Extract only text content using Document AI"""
         try:
-            logger.info(f"Starting text-only extraction for: {pdf_path}")
+            logger.info("Starting text-only extraction for: %s", pdf_path)
 
             document = self._process_with_document_ai(pdf_path)
             if not document:
@@ -73,18 +241,19 @@ class PDFExtractor:
             result = self._extract_text_from_document(document)
 
             logger.info(
-                f"Text extraction completed. Found {len(result.get('pages', []))} pages"
+                "Text extraction completed. Found %s pages",
+                len(result.get("pages", [])),
             )
             return result
 
         except Exception as e:
-            logger.error(f"Text extraction failed: {str(e)}", exc_info=True)
+            logger.error("Text extraction failed: %s", e, exc_info=True)
             raise
 
     def extract_tables_only(self, pdf_path: str) -> Dict[str, Any]:
         """Extract only tables using Document AI"""
         try:
-            logger.info(f"Starting table-only extraction for: {pdf_path}")
+            logger.info("Starting table-only extraction for: %s", pdf_path)
 
             document = self._process_with_document_ai(pdf_path)
             if not document:
@@ -94,59 +263,231 @@ class PDFExtractor:
             result = self._extract_tables_from_document(document)
 
             logger.info(
-                f"Table extraction completed. Found {len(result.get('tables', []))} tables"
+                "Table extraction completed. Found %s tables",
+                len(result.get("tables", [])),
             )
             return result
 
         except Exception as e:
-            logger.error(f"Table extraction failed: {str(e)}", exc_info=True)
+            logger.error("Table extraction failed: %s", e, exc_info=True)
             raise
 
-    def _process_with_document_ai(self, pdf_path: str) -> Optional[Any]:
-        """Process PDF with Google Document AI"""
+    def _process_with_document_ai(self, pdf_path: Union[str, bytes]) -> Optional[Any]:
+        """Process PDF (a path or the PDF's bytes) with Google Document AI"""
         try:
-            logger.info("Initializing Document AI client...")
-            client = documentai.DocumentProcessorServiceClient()
+            client = _get_client(self.location, self.credentials)
 
-            # Read PDF file
-            logger.info("Reading PDF file...")
-            with open(pdf_path, "rb") as image:
-                image_content = image.read()
+            if isinstance(pdf_path, bytes):
+                # In-memory chunk; nothing to read
+                image_content = pdf_path
+            else:
+                # Read PDF file
+                logger.info("Reading PDF file...")
+                with open(pdf_path, "rb") as image:
+                    image_content = image.read()
 
-            logger.info(f"PDF file read successfully. Size: {len(image_content)} bytes")
+            logger.info(
+                "PDF file read successfully. Size: %s bytes", len(image_content)
+            )
 
-            # Prepare the request
-            processor_name = f"projects/{self.project_id}/locations/{self.location}/processors/{self.processor_id}"
+            key = (self.processor_name, hashlib.sha256(image_content).digest())
+            serialized = _document_cache.get_or_compute(
+                key,
+                lambda: _serialize_document(
+                    self._request_document(client, image_content)
+                ),
+            )
+            # A fresh copy per call, so callers never share a cached document
+            return documentai.Document.deserialize(serialized)
 
-            logger.info(f"Processing document with processor: {processor_name}")
+        except gcp_exceptions.GoogleAPIError as e:
+            logger.error("Google API error: %s", e)
+            return None
+        except Exception as e:
+            logger.error("Error processing with Document AI: %s", e)
+            return None
 
-            logger.info("Processing document with Document AI...")
+    def _request_document(self, client: Any, image_content: bytes) -> Any:
+        """
+        Send one PDF to Document AI
 
-            # Build request
-            request_kwargs = {
-                "name": processor_name,
-                "raw_document": documentai.RawDocument(
-                    content=image_content, mime_type="application/pdf"
+        Args:
+            client: Document AI client
+            image_content: The PDF's bytes
+
+        Returns:
+            Processed Document AI document
+        """
+        logger.info("Processing document with processor: %s", self.processor_name)
+
+        logger.info("Processing document with Document AI...")
+
+        # Build request
+        request_kwargs = {
+            "name": self.processor_name,
+            "raw_document": documentai.RawDocument(
+                content=image_content, mime_type="application/pdf"
+            ),
+        }
+
+        request = documentai.ProcessRequest(**request_kwargs)
+
+        _document_ai_limiter.acquire()
+        logger.info("Sending request to Document AI...")
+        result = client.process_document(request=request)
+        document = result.document
+
+        logger.info("Document AI processing completed successfully")
+        logger.info("Document has %s pages", len(document.pages))
+
+        return document
+
+    def extract_batch(
+        self, pdf_paths: List[Union[str, bytes]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract several PDFs with one Document AI batch request
+
+        The files are staged in GCS_STAGING_BUCKET, processed server-side in
+        parallel, and the staged inputs and outputs are deleted afterwards.
+        The operation is waited on for at most BATCH_TIMEOUT seconds, and never
+        past REQUEST_TIMEOUT less BATCH_DEADLINE_MARGIN; on timeout it is
+        cancelled before the staged files are deleted.
+
+        Args:
+            pdf_paths: Paths to the PDF files, or the PDFs' bytes
+
+        Returns:
+            One result per PDF, in the same shape as extract_from_pdf, or
+            None for documents the batch failed to process
+
+        Raises:
+            concurrent.futures.TimeoutError: If the batch does not finish in time
+        """
+        deadline = time.monotonic() + Config.REQUEST_TIMEOUT - BATCH_DEADLINE_MARGIN
+        client = _get_client(self.location, self.credentials)
+        storage_client = storage.Client(
+            project=self.project_id,
+            credentials=self.credentials or _client_credentials.get(self.location),
+        )
+        bucket = storage_client.bucket(Config.GCS_STAGING_BUCKET)
+        prefix = f"pdf-extractor/{uuid.uuid4().hex}"
+
+        try:
+            # Uploads are network-bound, so overlap them
+            workers = max(1, min(len(pdf_paths), Config.MAX_PARALLEL_CHUNKS))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="pdf-upload"
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._stage_pdf, bucket, f"{prefix}/input/{index}.pdf", pdf_path
+                    )
+                    for index, pdf_path in enumerate(pdf_paths)
+                ]
+                input_uris = [future.result() for future in futures]
+
+            request = documentai.BatchProcessRequest(
+                name=self.processor_name,
+                input_documents=documentai.BatchDocumentsInputConfig(
+                    gcs_documents=documentai.GcsDocuments(
+                        documents=[
+                            documentai.GcsDocument(
+                                gcs_uri=uri, mime_type="application/pdf"
+                            )
+                            for uri in input_uris
+                        ]
+                    )
                 ),
-            }
+                document_output_config=documentai.DocumentOutputConfig(
+                    gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                        gcs_uri=f"gs://{bucket.name}/{prefix}/output/"
+                    )
+                ),
+            )
 
-            request = documentai.ProcessRequest(**request_kwargs)
+            _document_ai_limiter.acquire()
+            logger.info("Sending batch of %s documents to Document AI", len(pdf_paths))
+            operation = client.batch_process_documents(request=request)
+            timeout = max(0.0, min(Config.BATCH_TIMEOUT, deadline - time.monotonic()))
+            try:
+                operation.result(timeout=timeout)
+            except FutureTimeoutError:
+                logger.error(
+                    "Batch of %s documents timed out after %.0fs, cancelling",
+                    len(pdf_paths),
+                    timeout,
+                )
+                try:
+                    operation.cancel()
+                except Exception as e:
+                    logger.warning("Error cancelling batch operation: %s", e)
+                raise
+            metadata = documentai.BatchProcessMetadata(operation.metadata)
+
+            results: List[Optional[Dict[str, Any]]] = [None] * len(pdf_paths)
+            positions = {uri: index for index, uri in enumerate(input_uris)}
+            for status in metadata.individual_process_statuses:
+                index = positions.get(status.input_gcs_source)
+                if index is None:
+                    continue
+                if status.status.code != 0:
+                    logger.warning(
+                        "Batch document %s failed: %s", index, status.status.message
+                    )
+                    continue
+
+                # gs://bucket/path/ -> path/
+                output_prefix = status.output_gcs_destination.split("/", 3)[3]
+                shards = [
+                    blob
+                    for blob in storage_client.list_blobs(
+                        bucket.name, prefix=output_prefix.rstrip("/") + "/"
+                    )
+                    if blob.name.endswith(".json")
+                ]
+                if len(shards) != 1:
+                    # Chunks stay far below the sharding size; anything else
+                    # is left for the caller to reprocess
+                    logger.warning(
+                        "Batch document %s returned %s output shards",
+                        index,
+                        len(shards),
+                    )
+                    continue
 
-            logger.info("Sending request to Document AI...")
-            result = client.process_document(request=request)
-            document = result.document
+                document = documentai.Document.from_json(
+                    shards[0].download_as_bytes(), ignore_unknown_fields=True
+                )
+                results[index] = self._parse_document_ai_response(document)
 
-            logger.info("Document AI processing completed successfully")
-            logger.info(f"Document has {len(document.pages)} pages")
+            return results
 
-            return document
+        finally:
+            try:
+                for blob in storage_client.list_blobs(bucket.name, prefix=prefix):
+                    blob.delete()
+            except Exception as e:
+                logger.warning("Error deleting staged batch files %s: %s", prefix, e)
 
-        except gcp_exceptions.GoogleAPIError as e:
-            logger.error(f"Google API error: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Error processing with Document AI: {str(e)}")
-            return None
+    def _stage_pdf(self, bucket: Any, name: str, pdf_path: Union[str, bytes]) -> str:
+        """
+        Upload one PDF to the staging bucket
+
+        Args:
+            bucket: GCS bucket to upload into
+            name: Object name for the PDF
+            pdf_path: Path to the PDF file, or the PDF's bytes
+
+        Returns:
+            gs:// URI of the uploaded PDF
+        """
+        blob = bucket.blob(name)
+        if isinstance(pdf_path, bytes):
+            blob.upload_from_string(pdf_path, content_type="application/pdf")
+        else:
+            blob.upload_from_filename(pdf_path, content_type="application/pdf")
+        return f"gs://{bucket.name}/{blob.name}"
 
     def _process_large_document(
         self, client: Any, processor_name: str, image_content: bytes
@@ -177,7 +518,8 @@ class PDFExtractor:
             document = result.document
 
             logger.info(
-                f"Document AI processing completed (partial: {len(document.pages)} pages)"
+                "Document AI processing completed (partial: %s pages)",
+                len(document.pages),
             )
             logger.warning(
                 "This is a partial result. Consider splitting the PDF for complete processing."
@@ -186,7 +528,7 @@ class PDFExtractor:
             return document
 
         except Exception as e:
-            logger.error(f"Error processing large document: {str(e)}")
+            logger.error("Error processing large document: %s", e)
             return None
 
     def _parse_document_ai_response(self, document: Any) -> Dict[str, Any]:
@@ -194,16 +536,11 @@ class PDFExtractor:
         try:
             logger.info("Parsing Document AI response...")
 
-            # Extract text and tables
-            text_result = self._extract_text_from_document(document)
-            tables_result = self._extract_tables_from_document(document)
+            # Extract text and tables in a single pass over the pages
+            extracted = self._extract_all(document)
 
             # Get the full text from Document AI (document.text)
-            full_text = (
-                document.text
-                if hasattr(document, "text")
-                else text_result.get("raw_text", "")
-            )
+            full_text = extracted["text"]
 
             # Convert Document AI response to markdown using V3 converter
             logger.info("Converting Document AI response to markdown...")
@@ -212,11 +549,12 @@ class PDFExtractor:
                 document_dict = self._document_to_dict(document)
                 markdown_content = convert_document_ai_to_markdown(document_dict)
                 logger.info(
-                    f"Markdown conversion completed. Length: {len(markdown_content)} characters"
+                    "Markdown conversion completed. Length: %s characters",
+                    len(markdown_content),
                 )
             except Exception as e:
                 logger.warning(
-                    f"Markdown conversion failed: {str(e)}. Using fallback markdown."
+                    "Markdown conversion failed: %s. Using fallback markdown.", e
                 )
                 # Fallback: Create basic markdown from full text
                 if full_text:
@@ -226,17 +564,17 @@ class PDFExtractor:
 
             # Combine results
             result = {
-                "pages": text_result.get("pages", []),
-                "tables": tables_result.get("tables", []),
+                "pages": extracted["pages"],
+                "tables": extracted["tables"],
                 "full_text": full_text,  # Use actual Document AI text
                 "markdown": markdown_content,  # Add V3 markdown conversion
                 "metadata": {
                     "total_pages": len(document.pages),
-                    "total_tables": len(tables_result.get("tables", [])),
+                    "total_tables": len(extracted["tables"]),
                     "extraction_method": "google_document_ai",
                     "confidence": self._calculate_overall_confidence(document),
                 },
-                "raw_text": text_result.get("raw_text", ""),
+                "raw_text": extracted["raw_text"],
                 "structured_data": {
                     "entities": self._extract_entities(document),
                     "form_fields": self._extract_form_fields(document),
@@ -247,15 +585,19 @@ class PDFExtractor:
             return result
 
         except Exception as e:
-            logger.error(f"Error parsing Document AI response: {str(e)}")
+            logger.error("Error parsing Document AI response: %s", e)
             raise
 
     def _document_to_dict(self, document: Any) -> Dict[str, Any]:
         """Convert Document AI document object to dictionary format for V3 converter"""
         try:
+            # proto-plus copies string fields on every access, so read the
+            # (possibly multi-MB) text once
+            document_text = document.text if hasattr(document, "text") else ""
+
             # Create a simple structure that the V3 converter can work with
             document_dict = {
-                "text": document.text if hasattr(document, "text") else "",
+                "text": document_text,
                 "pages": [],
             }
 
@@ -283,7 +625,7 @@ class PDFExtractor:
 
                         # Extract text from paragraph
                         paragraph_text = self._get_text_from_layout(
-                            layout, document.text
+                            layout, document_text
                         )
                         if paragraph_text.strip():
                             # Create paragraph dict with proper structure
@@ -308,7 +650,7 @@ class PDFExtractor:
                             }
                             page_dict["paragraphs"].append(para_dict)
                     except Exception as e:
-                        logger.warning(f"Error processing paragraph: {str(e)}")
+                        logger.warning("Error processing paragraph: %s", e)
                         continue
 
                 # Convert tables
@@ -394,7 +736,7 @@ class PDFExtractor:
 
                         page_dict["tables"].append(table_dict)
                     except Exception as e:
-                        logger.warning(f"Error processing table: {str(e)}")
+                        logger.warning("Error processing table: %s", e)
                         continue
 
                 # Convert form fields
@@ -442,7 +784,7 @@ class PDFExtractor:
                         }
                         page_dict["formFields"].append(field_dict)
                     except Exception as e:
-                        logger.warning(f"Error processing form field: {str(e)}")
+                        logger.warning("Error processing form field: %s", e)
                         continue
 
                 document_dict["pages"].append(page_dict)
@@ -450,112 +792,197 @@ class PDFExtractor:
             return document_dict
 
         except Exception as e:
-            logger.error(f"Error converting document to dict: {str(e)}")
+            logger.error("Error converting document to dict: %s", e)
             # Return minimal structure if conversion fails
             return {
                 "text": document.text if hasattr(document, "text") else "",
                 "pages": [],
             }
 
-    def _extract_text_from_document(self, document: Any) -> Dict[str, Any]:
-        """Extract text content from Document AI response"""
+    def _extract_all(self, document: Any) -> Dict[str, Any]:
+        """
+        Extract text and tables from Document AI response in one pass
+
+        Args:
+            document: Document AI document
+
+        Returns:
+            Dict with pages, tables, raw_text and the document text
+        """
         try:
             pages_data = []
             all_text = []
+            tables_data = []
+            # Read once; every access copies the whole string
+            document_text = document.text
 
-            logger.info(f"Extracting text from {len(document.pages)} pages...")
+            logger.info(
+                "Extracting text and tables from %s pages...", len(document.pages)
+            )
 
             for page_num, page in enumerate(document.pages):
-                logger.info(f"Processing page {page_num + 1}/{len(document.pages)}")
+                page_data = self._extract_page_text(page_num, page, document_text)
+                pages_data.append(page_data)
+                all_text.append(page_data["text"])
+                tables_data.extend(
+                    self._extract_page_tables(page_num, page, document_text)
+                )
 
-                # Extract text from page
-                page_text = ""
-                text_elements = []
+            logger.info("Total tables extracted: %s", len(tables_data))
+            return {
+                "pages": pages_data,
+                "tables": tables_data,
+                "raw_text": "\n\n".join(all_text),
+                "text": document_text,
+            }
 
-                for paragraph in page.paragraphs:
-                    paragraph_text = self._get_text_from_layout(
-                        paragraph.layout, document.text
-                    )
-                    if paragraph_text.strip():
-                        page_text += paragraph_text + "\n"
-                        text_elements.append(
-                            {
-                                "text": paragraph_text.strip(),
-                                "confidence": paragraph.layout.confidence
-                                if hasattr(paragraph.layout, "confidence")
-                                else 1.0,
-                                "bounding_box": self._get_bounding_box(
-                                    paragraph.layout.bounding_poly
-                                ),
-                            }
-                        )
+        except Exception as e:
+            logger.error("Error extracting text and tables: %s", e)
+            raise
 
-                page_data = {
-                    "page_number": page_num + 1,
-                    "text": page_text.strip(),
-                    "text_elements": text_elements,
-                    "word_count": len(page_text.split()),
-                    "confidence": self._calculate_page_confidence(text_elements),
-                }
+    def _extract_text_from_document(self, document: Any) -> Dict[str, Any]:
+        """Extract text content from Document AI response"""
+        try:
+            pages_data = []
+            # Read once; every access copies the whole string
+            document_text = document.text
 
-                pages_data.append(page_data)
-                all_text.append(page_text.strip())
+            logger.info("Extracting text from %s pages...", len(document.pages))
 
-                logger.info(
-                    f"Page {page_num + 1}: {len(text_elements)} text elements, {page_data['word_count']} words"
+            for page_num, page in enumerate(document.pages):
+                pages_data.append(
+                    self._extract_page_text(page_num, page, document_text)
                 )
 
-            return {"pages": pages_data, "raw_text": "\n\n".join(all_text)}
+            return {
+                "pages": pages_data,
+                "raw_text": "\n\n".join(page["text"] for page in pages_data),
+            }
 
         except Exception as e:
-            logger.error(f"Error extracting text: {str(e)}")
+            logger.error("Error extracting text: %s", e)
             raise
 
     def _extract_tables_from_document(self, document: Any) -> Dict[str, Any]:
         """Extract tables from Document AI response"""
         try:
             tables_data = []
+            # Read once; every access copies the whole string
+            document_text = document.text
 
-            logger.info(f"Extracting tables from {len(document.pages)} pages...")
+            logger.info("Extracting tables from %s pages...", len(document.pages))
 
             for page_num, page in enumerate(document.pages):
-                logger.info(f"Processing tables on page {page_num + 1}")
+                tables_data.extend(
+                    self._extract_page_tables(page_num, page, document_text)
+                )
 
-                for table_num, table in enumerate(page.tables):
-                    logger.info(
-                        f"Processing table {table_num + 1} on page {page_num + 1}"
-                    )
+            logger.info("Total tables extracted: %s", len(tables_data))
+            return {"tables": tables_data}
+
+        except Exception as e:
+            logger.error("Error extracting tables: %s", e)
+            raise
+
+    def _extract_page_text(
+        self, page_num: int, page: Any, document_text: str
+    ) -> Dict[str, Any]:
+        """
+        Extract text content from a single page
 
-                    # Extract table data
-                    table_data = self._parse_table(table, document.text)
+        Args:
+            page_num: 0-based page index
+            page: Document AI page
+            document_text: Full document text the layouts point into
 
-                    table_info = {
-                        "table_id": f"page_{page_num + 1}_table_{table_num + 1}",
-                        "page_number": page_num + 1,
-                        "table_number": table_num + 1,
-                        "data": table_data["rows"],
-                        "headers": table_data["headers"],
-                        "confidence": table_data["confidence"],
+        Returns:
+            Page data dictionary
+        """
+        logger.debug("Processing page %s", page_num + 1)
+
+        # Extract text from page; collect the pieces and join once
+        # rather than growing a string per paragraph
+        page_parts = []
+        text_elements = []
+
+        for paragraph in page.paragraphs:
+            paragraph_text = self._get_text_from_layout(paragraph.layout, document_text)
+            if paragraph_text.strip():
+                page_parts.append(paragraph_text)
+                text_elements.append(
+                    {
+                        "text": paragraph_text.strip(),
+                        "confidence": paragraph.layout.confidence
+                        if hasattr(paragraph.layout, "confidence")
+                        else 1.0,
                         "bounding_box": self._get_bounding_box(
-                            table.layout.bounding_poly
+                            paragraph.layout.bounding_poly
                         ),
-                        "row_count": len(table_data["rows"]),
-                        "column_count": len(table_data["headers"])
-                        if table_data["headers"]
-                        else 0,
                     }
+                )
 
-                    tables_data.append(table_info)
-                    logger.info(
-                        f"Table {table_num + 1}: {table_info['row_count']} rows, {table_info['column_count']} columns"
-                    )
+        page_text = "\n".join(page_parts).strip()
+        page_data = {
+            "page_number": page_num + 1,
+            "text": page_text,
+            "text_elements": text_elements,
+            "word_count": len(page_text.split()),
+            "confidence": self._calculate_page_confidence(text_elements),
+        }
+
+        logger.debug(
+            "Page %s: %s text elements, %s words",
+            page_num + 1,
+            len(text_elements),
+            page_data["word_count"],
+        )
+        return page_data
 
-            logger.info(f"Total tables extracted: {len(tables_data)}")
-            return {"tables": tables_data}
+    def _extract_page_tables(
+        self, page_num: int, page: Any, document_text: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract tables from a single page
 
-        except Exception as e:
-            logger.error(f"Error extracting tables: {str(e)}")
-            raise
+        Args:
+            page_num: 0-based page index
+            page: Document AI page
+            document_text: Full document text the layouts point into
+
+        Returns:
+            List of table info dictionaries
+        """
+        tables_data = []
+
+        for table_num, table in enumerate(page.tables):
+            logger.debug("Processing table %s on page %s", table_num + 1, page_num + 1)
+
+            # Extract table data
+            table_data = self._parse_table(table, document_text)
+
+            table_info = {
+                "table_id": f"page_{page_num + 1}_table_{table_num + 1}",
+                "page_number": page_num + 1,
+                "table_number": table_num + 1,
+                "data": table_data["rows"],
+                "headers": table_data["headers"],
+                "confidence": table_data["confidence"],
+                "bounding_box": self._get_bounding_box(table.layout.bounding_poly),
+                "row_count": len(table_data["rows"]),
+                "column_count": len(table_data["headers"])
+                if table_data["headers"]
+                else 0,
+            }
+
+            tables_data.append(table_info)
+            logger.debug(
+                "Table %s: %s rows, %s columns",
+                table_num + 1,
+                table_info["row_count"],
+                table_info["column_count"],
+            )
+
+        return tables_data
 
     def _parse_table(self, table: Any, document_text: str) -> Dict[str, Any]:
         """Parse individual table from Document AI"""
@@ -588,49 +1015,51 @@ class PDFExtractor:
             return {"rows": rows, "headers": headers, "confidence": confidence}
 
         except Exception as e:
-            logger.error(f"Error parsing table: {str(e)}")
+            logger.error("Error parsing table: %s", e)
             return {"rows": [], "headers": [], "confidence": 0.0}
 
     def _get_text_from_layout(self, layout: Any, document_text: str) -> str:
         """Extract text from layout element"""
         try:
-            if not layout.text_anchor:
+            text_anchor = layout.text_anchor
+            if not text_anchor:
                 return ""
 
-            # Extract text using text anchor
-            start_index = (
-                layout.text_anchor.text_segments[0].start_index
-                if layout.text_anchor.text_segments
-                else 0
+            # Extract text using text anchor; an element can span several
+            # segments (e.g. a paragraph broken across columns)
+            segments = text_anchor.text_segments
+            if len(segments) == 1:
+                segment = segments[0]
+                return document_text[segment.start_index : segment.end_index]
+            return "".join(
+                document_text[segment.start_index : segment.end_index]
+                for segment in segments
             )
-            end_index = (
-                layout.text_anchor.text_segments[0].end_index
-                if layout.text_anchor.text_segments
-                else 0
-            )
-
-            return document_text[start_index:end_index]
 
         except Exception as e:
-            logger.warning(f"Error extracting text from layout: {str(e)}")
+            logger.warning("Error extracting text from layout: %s", e)
             return ""
 
     def _get_bounding_box(self, bounding_poly: Any) -> Dict[str, float]:
         """Extract bounding box coordinates"""
         try:
-            if not bounding_poly.vertices:
+            # Each field or element access on the proto wraps a new object,
+            # so fetch the vertex list and the two corners once
+            vertices = bounding_poly.vertices
+            if not vertices:
                 return {"x1": 0, "y1": 0, "x2": 0, "y2": 0}
 
-            vertices = bounding_poly.vertices
+            top_left = vertices[0]
+            bottom_right = vertices[2] if len(vertices) > 2 else top_left
             return {
-                "x1": vertices[0].x if len(vertices) > 0 else 0,
-                "y1": vertices[0].y if len(vertices) > 0 else 0,
-                "x2": vertices[2].x if len(vertices) > 2 else vertices[0].x,
-                "y2": vertices[2].y if len(vertices) > 2 else vertices[0].y,
+                "x1": top_left.x,
+                "y1": top_left.y,
+                "x2": bottom_right.x,
+                "y2": bottom_right.y,
             }
 
         except Exception as e:
-            logger.warning(f"Error extracting bounding box: {str(e)}")
+            logger.warning("Error extracting bounding box: %s", e)
             return {"x1": 0, "y1": 0, "x2": 0, "y2": 0}
 
     def _calculate_page_confidence(self, text_elements: List[Dict]) -> float:
@@ -673,7 +1102,7 @@ class PDFExtractor:
             return entities
 
         except Exception as e:
-            logger.warning(f"Error extracting entities: {str(e)}")
+            logger.warning("Error extracting entities: %s", e)
             return []
 
     def _extract_form_fields(self, document: Any) -> List[Dict[str, Any]]:
@@ -695,5 +1124,5 @@ class PDFExtractor:
             return form_fields
 
         except Exception as e:
-            logger.warning(f"Error extracting form fields: {str(e)}")
+            logger.warning("Error extracting form fields: %s", e)
             return []
@@ -0,0 +1,105 @@
+"""
+Extraction result cache
+Memoizes results by PDF content hash and coalesces concurrent requests for
+the same PDF so Document AI is only called once
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Thread-safe LRU cache with per-entry TTL and in-flight request coalescing"""
+
+    def __init__(
+        self,
+        maxsize: int = 100,
+        ttl: int = 3600,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] = len,
+    ):
+        """
+        Initialize result cache
+
+        Args:
+            maxsize: Maximum number of cached results (0 disables caching)
+            ttl: Seconds a result stays valid
+            max_bytes: Maximum total size of cached results (0 for no limit)
+            sizeof: Size of a result in bytes, used when max_bytes is set
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._bytes = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        logger.info("ResultCache initialized with maxsize=%s, ttl=%ss", maxsize, ttl)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, computing it if needed
+
+        If another thread is already computing the same key, wait for its
+        result instead of starting a second computation.
+
+        Args:
+            key: Cache key (e.g. PDF content hash)
+            compute: Callable producing the result on a cache miss
+
+        Returns:
+            Cached or freshly computed result
+        """
+        if self.maxsize <= 0:
+            return compute()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, size = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    logger.info("Result cache hit")
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            logger.info("Identical PDF already processing, waiting for its result")
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        size = self.sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            del self._in_flight[key]
+            # A result bigger than the whole budget is returned but not kept
+            if not self.max_bytes or size <= self.max_bytes:
+                self._entries[key] = (time.monotonic() + self.ttl, value, size)
+                self._bytes += size
+                while len(self._entries) > self.maxsize or (
+                    self.max_bytes and self._bytes > self.max_bytes
+                ):
+                    self._bytes -= self._entries.popitem(last=False)[1][2]
+        future.set_result(value)
+
+        return value
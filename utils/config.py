@@ -11,6 +11,7 @@ class Config:
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", 5001))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
 
     # Google Cloud Document AI settings
     GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
@@ -20,6 +21,34 @@ class Config:
 
     # Document AI processing options
     MAX_PAGES_PER_REQUEST = int(os.getenv("MAX_PAGES_PER_REQUEST", "15"))
+    # Shared by all worker processes on the host (not across hosts)
+    DOCUMENT_AI_MAX_RPS = float(os.getenv("DOCUMENT_AI_MAX_RPS", "5"))
+    MAX_PARALLEL_CHUNKS = int(os.getenv("MAX_PARALLEL_CHUNKS", "3"))
+    CHUNK_MAX_ATTEMPTS = int(os.getenv("CHUNK_MAX_ATTEMPTS", "3"))
+    # PDFs split into at least BATCH_API_THRESHOLD chunks are sent as one
+    # Document AI batch request staged in this GCS bucket (unset disables)
+    GCS_STAGING_BUCKET = os.getenv("GCS_STAGING_BUCKET")
+    BATCH_API_THRESHOLD = int(os.getenv("BATCH_API_THRESHOLD", "10"))
+    # Capped at REQUEST_TIMEOUT less a margin, so a batch never outlives its caller
+    BATCH_TIMEOUT = int(os.getenv("BATCH_TIMEOUT", "540"))  # 9 minutes
+    # /extract-text answers from the PDF's own text layer when it averages at
+    # least this many characters per page
+    LOCAL_TEXT_MIN_CHARS_PER_PAGE = int(
+        os.getenv("LOCAL_TEXT_MIN_CHARS_PER_PAGE", "200")
+    )
+    # Text layers of PDFs with at least this many pages are read by a pool of
+    # LOCAL_TEXT_WORKERS processes
+    LOCAL_TEXT_PARALLEL_MIN_PAGES = int(
+        os.getenv("LOCAL_TEXT_PARALLEL_MIN_PAGES", "50")
+    )
+    # An empty value, as in the env templates, also means the default
+    LOCAL_TEXT_WORKERS = int(
+        os.getenv("LOCAL_TEXT_WORKERS") or min(os.cpu_count() or 1, 4)
+    )
+    # Opt-in: /extract-tables answers "no tables" locally for born-digital PDFs
+    # up to this many pages when no ruled table is found on any page. Borderless
+    # tables are missed by the local check (0, the default, disables it)
+    TABLE_PRESCAN_MAX_PAGES = int(os.getenv("TABLE_PRESCAN_MAX_PAGES", "0"))
 
     @classmethod
     def validate_google_config(cls):
@@ -45,6 +74,27 @@ class Config:
     MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 50 * 1024 * 1024))  # 50MB
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads")
     TEMP_FOLDER = os.getenv("TEMP_FOLDER", "temp")
+    # Temp files whose worker process has exited are swept once older than this
+    TEMP_FILE_MAX_AGE = int(os.getenv("TEMP_FILE_MAX_AGE", "3600"))  # 1 hour
+    TEMP_SWEEP_INTERVAL = int(os.getenv("TEMP_SWEEP_INTERVAL", "60"))
+
+    # Background job settings
+    MAX_CONCURRENT_TASKS = int(os.getenv("MAX_CONCURRENT_TASKS", "5"))
+    JOBS_FOLDER = os.getenv("JOBS_FOLDER", os.path.join(TEMP_FOLDER, "jobs"))
+    JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))  # 1 hour
+    # Tasks accepted at once (running + waiting); beyond this requests get a 503
+    MAX_PENDING_TASKS = int(
+        os.getenv("MAX_PENDING_TASKS", str(2 * MAX_CONCURRENT_TASKS))
+    )
+    REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "600"))  # 10 minutes
+
+    # Result cache settings (RESULT_CACHE_SIZE=0 disables caching)
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "100"))
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))  # 1 hour
+    # Document AI responses kept per PDF content hash, per worker process
+    # (DOCUMENT_CACHE_SIZE=0 disables), bounded to DOCUMENT_CACHE_MAX_MB in total
+    DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "50"))
+    DOCUMENT_CACHE_MAX_MB = int(os.getenv("DOCUMENT_CACHE_MAX_MB", "64"))
 
     # Processing settings
     ENABLE_TABLE_EXTRACTION = (
@@ -52,9 +102,6 @@ class Config:
     )
     ENABLE_OCR_EXTRACTION = os.getenv("ENABLE_OCR_EXTRACTION", "True").lower() == "true"
 
-    # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
     @classmethod
     def create_directories(cls):
         """Create necessary directories if they don't exist"""
@@ -1,9 +1,20 @@
 import os
+import re
+import mmap
+import stat
+import hashlib
 import logging
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in saved filenames
+_RE_UNSAFE_CHARS = re.compile(r"[^\w\-_\.]")
+
+# PDF readers accept the header anywhere in the first 1024 bytes
+_PDF_HEADER = b"%PDF-"
+_PDF_HEADER_SEARCH_BYTES = 1024
+
 
 class FileHandler:
     """Handle file operations for the PDF extractor"""
@@ -25,14 +36,24 @@ class FileHandler:
         result = {"valid": True, "errors": [], "file_info": {}}
 
         try:
-            # Check if file exists
-            if not os.path.exists(file_path):
+            # Check if file exists; every check below reads this one stat
+            # rather than asking the filesystem again
+            try:
+                file_stat = os.stat(file_path)
+            except (OSError, ValueError):
+                # Same failures os.path.exists() reports as missing
                 result["valid"] = False
                 result["errors"].append("File does not exist")
                 return result
 
+            if not stat.S_ISREG(file_stat.st_mode):
+                result["valid"] = False
+                result["errors"].append("Not a regular file")
+                return result
+
+            file_size = file_stat.st_size
+
             # Get file info
-            file_size = os.path.getsize(file_path)
             file_name = os.path.basename(file_path)
             file_ext = os.path.splitext(file_name)[1].lower()
 
@@ -55,18 +76,42 @@ class FileHandler:
                 result["errors"].append(
                     f"Invalid file type: {file_ext} (only PDF allowed)"
                 )
+            elif result["valid"] and not FileHandler.has_pdf_header(file_path):
+                # Only open the file once the cheap checks have passed
+                result["valid"] = False
+                result["errors"].append("File is not a valid PDF")
 
             logger.info(
-                f"File validation completed: {file_name} - Valid: {result['valid']}"
+                "File validation completed: %s - Valid: %s", file_name, result["valid"]
             )
 
         except Exception as e:
             result["valid"] = False
             result["errors"].append(f"Validation error: {str(e)}")
-            logger.error(f"File validation failed: {str(e)}")
+            logger.error("File validation failed: %s", e)
 
         return result
 
+    @staticmethod
+    def has_pdf_header(file_path: str) -> bool:
+        """
+        Check that a file starts like a PDF
+
+        Only the first kilobyte is read, so misnamed or corrupt uploads are
+        rejected before anything parses them
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the PDF header is present
+        """
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            return _PDF_HEADER in os.read(fd, _PDF_HEADER_SEARCH_BYTES)
+        finally:
+            os.close(fd)
+
     @staticmethod
     def cleanup_file(file_path: str) -> bool:
         """
@@ -79,15 +124,45 @@ class FileHandler:
             True if successful, False otherwise
         """
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Cleaned up file: {file_path}")
-                return True
+            # unlink directly rather than exists() + remove(), which is racy
+            os.unlink(file_path)
+            logger.info("Cleaned up file: %s", file_path)
+            return True
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logger.error(f"Failed to cleanup file {file_path}: {str(e)}")
+            logger.error("Failed to cleanup file %s: %s", file_path, e)
 
         return False
 
+    @staticmethod
+    def compute_sha256(file_path: str) -> bytes:
+        """
+        Compute the SHA-256 digest of a file's contents
+
+        The file is memory-mapped and hashed in one call, so no copy of its
+        contents is made in Python
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Raw digest bytes
+        """
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size == 0:
+                # mmap cannot map an empty file
+                return hashlib.sha256().digest()
+
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).digest()
+        finally:
+            os.close(fd)
+
     @staticmethod
     def get_safe_filename(filename: str) -> str:
         """
@@ -99,8 +174,5 @@ class FileHandler:
         Returns:
             Safe filename
         """
-        import re
-
         # Remove special characters and replace with underscores
-        safe_name = re.sub(r"[^\w\-_\.]", "_", filename)
-        return safe_name
+        return _RE_UNSAFE_CHARS.sub("_", filename)
@@ -0,0 +1,71 @@
+import os
+import fcntl
+import struct
+import threading
+import time
+
+_SLOT = struct.Struct("d")
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls to at most `rate` per second"""
+
+    def __init__(self, rate: float, state_file: str = None):
+        """
+        Initialize rate limiter
+
+        Args:
+            rate: Maximum calls per second (0 or less disables limiting)
+            state_file: File through which every process using the same path
+                shares one budget (defaults to a budget for this process only)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.state_file = state_file
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self._fd = None
+        if state_file:
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def acquire(self) -> None:
+        """Block until the caller may issue its next call"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            if self.state_file:
+                # Wall-clock time, so every process reads slots on one clock
+                now = time.time()
+                slot = self._reserve_shared_slot(now)
+            else:
+                now = time.monotonic()
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def _reserve_shared_slot(self, now: float) -> float:
+        """Claim the next free slot recorded in the state file"""
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            self._fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o600)
+
+        # flock excludes other processes; threads are serialized by _lock
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            data = os.pread(self._fd, _SLOT.size, 0)
+            next_slot = _SLOT.unpack(data)[0] if len(data) == _SLOT.size else 0.0
+            slot = max(now, next_slot)
+            os.pwrite(self._fd, _SLOT.pack(slot + self.interval), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return slot
+
+    def _after_fork(self) -> None:
+        """Reopen the state file; an inherited descriptor shares the parent's lock"""
+        self._lock = threading.Lock()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,94 @@
+import os
+import atexit
+import logging
+import tempfile
+import threading
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class TempFilePool:
+    """Bounded pool of pre-created temp files reused across requests"""
+
+    def __init__(self, size: int, directory: str = None, suffix: str = ".pdf"):
+        """
+        Initialize temp file pool
+
+        Args:
+            size: Number of files kept ready in the pool
+            directory: Directory holding the files (defaults to <tmpdir>/pdf-extractor)
+            suffix: File name suffix for pooled files
+        """
+        if directory is None:
+            directory = os.path.join(tempfile.gettempdir(), "pdf-extractor")
+
+        self.directory = directory
+        self.size = size
+        self.suffix = suffix
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._free: List[str] = [self._create() for _ in range(size)]
+        atexit.register(self.close)
+        # A forked worker (gunicorn --preload) must not hand out the parent's files
+        os.register_at_fork(after_in_child=self._after_fork)
+        logger.info("TempFilePool initialized with %s files in %s", size, directory)
+
+    def acquire(self) -> str:
+        """
+        Take an empty temp file from the pool
+
+        Returns:
+            Path to a file owned by the caller until release() is called
+        """
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+
+        # Pool exhausted under load; hand out an extra file
+        return self._create()
+
+    def release(self, path: str) -> None:
+        """
+        Return a file to the pool, emptying it so its disk space is freed
+
+        Args:
+            path: Path previously returned by acquire()
+        """
+        try:
+            os.truncate(path, 0)
+        except FileNotFoundError:
+            # Caller removed the file; replace it to keep the pool full
+            path = self._create()
+
+        with self._lock:
+            if len(self._free) < self.size:
+                self._free.append(path)
+                return
+
+        os.remove(path)
+
+    def close(self) -> None:
+        """Delete the files currently sitting in the pool"""
+        with self._lock:
+            free, self._free = self._free, []
+
+        for path in free:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _after_fork(self) -> None:
+        """Give the child process its own files; the parent keeps the old ones"""
+        self._lock = threading.Lock()
+        self._free = [self._create() for _ in range(self.size)]
+
+    def _create(self) -> str:
+        # The owner's PID in the name lets the sweeper tell live files apart
+        fd, path = tempfile.mkstemp(
+            prefix=f"upload_{os.getpid()}_", suffix=self.suffix, dir=self.directory
+        )
+        os.close(fd)
+        return path
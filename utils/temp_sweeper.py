@@ -0,0 +1,101 @@
+import os
+import time
+import logging
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _owner_pid(name: str, prefix: str) -> Optional[int]:
+    """PID embedded in a <prefix><pid>_... file name, or None"""
+    owner = name[len(prefix) :].split("_", 1)[0]
+    return int(owner) if owner.isdigit() else None
+
+
+def _is_alive(pid: int) -> bool:
+    """Check whether a process with this PID exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+class TempFileSweeper:
+    """Background thread deleting temp files orphaned by crashed workers"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_age: int,
+        interval: int = 60,
+        prefixes: Tuple[str, ...] = ("upload_",),
+    ):
+        """
+        Initialize temp file sweeper
+
+        Args:
+            directory: Directory holding the temp files
+            max_age: Seconds since last modification before an orphaned
+                file is removed
+            interval: Seconds between sweeps
+            prefixes: File name prefixes the sweeper may delete
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.interval = interval
+        self.prefixes = prefixes
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Sweep once now, then keep sweeping in a daemon thread"""
+        self.sweep()
+        threading.Thread(target=self._loop, name="temp-sweeper", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def sweep(self) -> int:
+        """
+        Delete matching files of exited processes older than max_age
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = time.time() - self.max_age
+        removed = 0
+
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    prefix = next(
+                        (p for p in self.prefixes if entry.name.startswith(p)), None
+                    )
+                    if prefix is None:
+                        continue
+                    # Files are named <prefix><pid>_...; a live owner may
+                    # hand its file out at any moment, so leave it alone
+                    pid = _owner_pid(entry.name, prefix)
+                    if pid is None or _is_alive(pid):
+                        continue
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        # Released or cleaned up concurrently
+                        pass
+        except OSError as e:
+            logger.warning("Error sweeping %s: %s", self.directory, e)
+
+        if removed:
+            logger.info("Removed %s stale temp files from %s", removed, self.directory)
+        return removed
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sweep()